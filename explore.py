@@ -5,73 +5,241 @@ Claude Sessions Explorer CLI
 Browse and search your Claude Code session history.
 """
 
-import asyncio
-import json
+import mmap
+import os
 import sys
 from pathlib import Path
 from datetime import datetime
 from collections import Counter
+from functools import lru_cache
+from heapq import nlargest
+from operator import itemgetter
 import argparse
-import subprocess
+
+import orjson
 
 CLAUDE_DIR = Path.home() / ".claude"
 HISTORY_FILE = CLAUDE_DIR / "history.jsonl"
 PROJECTS_DIR = CLAUDE_DIR / "projects"
 STATS_FILE = CLAUDE_DIR / "stats-cache.json"
+CACHE_DIR = Path(".data/cache")  # Our own state; ~/.claude is only read
+TOOLS_CACHE_FILE = CACHE_DIR / "tool-usage.json"
+HISTORY_CACHE_FILE = CACHE_DIR / "history-count.json"
+SESSION_INDEX_FILE = CACHE_DIR / "session-index.json"
+PROJECTS_CACHE_FILE = CACHE_DIR / "projects.json"
+MMAP_MIN_SIZE = 64 * 1024
+POOL_MIN_FILES = 8  # Fewer stale files than this are counted in-process
 
 
 # ============ Data Loading ============
 
-def load_history():
-    """Load all prompts from history.jsonl"""
+def iter_lines(path: Path):
+    """Yield the raw lines of a file, scanning a read-only memory map"""
+    with open(path, "rb") as f:
+        size = os.fstat(f.fileno()).st_size
+        if size == 0:
+            return
+        # Setting up a mapping costs more than it saves on small files
+        if size < MMAP_MIN_SIZE:
+            lines = f.read().split(b"\n")
+            if not lines[-1]:
+                lines.pop()
+            yield from lines
+            return
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            pos, end = 0, len(mm)
+            while pos < end:
+                nl = mm.find(b"\n", pos)
+                if nl == -1:
+                    nl = end
+                yield mm[pos:nl]
+                pos = nl + 1
+
+
+def iter_matching_lines(path: Path, needle: bytes):
+    """Yield the raw lines of a file whose lowercased bytes contain needle"""
+    # Lowercase one line at a time so peak memory stays at a single line
+    for line in iter_lines(path):
+        if needle in line.lower():
+            yield line
+
+
+def iter_chunked_lines(path: Path, size: int = 1 << 20):
+    """Yield the raw lines of a file, reading it in large binary chunks"""
+    # Partial lines are kept as a list of pieces so a long line is joined once, not re-copied per chunk
+    pending = []
+    with open(path, "rb", buffering=0) as f:
+        while chunk := f.read(size):
+            end = chunk.rfind(b"\n")
+            if end == -1:
+                pending.append(chunk)
+                continue
+            pending.append(chunk[:end])
+            yield from b"".join(pending).split(b"\n")
+            pending = [chunk[end + 1:]]
+    tail = b"".join(pending)
+    if tail:
+        yield tail
+
+
+def iter_jsonl(path: Path, lines=iter_lines):
+    """Yield decoded records from a JSONL file, skipping malformed lines"""
+    for line in lines(path):
+        try:
+            yield orjson.loads(line)
+        except orjson.JSONDecodeError:
+            continue
+
+
+def iter_history():
+    """Yield prompts from history.jsonl one at a time"""
+    if HISTORY_FILE.exists():
+        yield from iter_jsonl(HISTORY_FILE)
+
+
+def count_history():
+    """Count prompts in history.jsonl, resuming from the last counted offset"""
     if not HISTORY_FILE.exists():
-        return []
-    entries = []
-    with open(HISTORY_FILE) as f:
+        return 0
+
+    cache = load_cache(HISTORY_CACHE_FILE)
+    with open(HISTORY_FILE, "rb") as f:
+        head = f.read(64).hex()
+        size = os.fstat(f.fileno()).st_size
+
+        # The file is append-only; start over if it shrank or was replaced
+        offset, count = 0, 0
+        if cache.get("head") == head and cache.get("offset", 0) <= size:
+            offset, count = cache["offset"], cache["count"]
+        if offset == size:
+            return count
+
+        f.seek(offset)
+        pending = 0
         for line in f:
             try:
-                entries.append(json.loads(line))
-            except json.JSONDecodeError:
-                continue
-    return entries
+                orjson.loads(line)
+                valid = 1
+            except orjson.JSONDecodeError:
+                valid = 0
+            if line.endswith(b"\n"):
+                offset += len(line)
+                count += valid
+            else:
+                # Line still being written; count it now but re-read it next time
+                pending = valid
+
+    save_cache(HISTORY_CACHE_FILE, {"head": head, "offset": offset, "count": count})
+    return count + pending
+
+
+def search_history(query):
+    """Find history entries whose prompt contains query (already lowercased)"""
+    if not HISTORY_FILE.exists():
+        return []
+
+    # Check raw lines before decoding. Only safe when the query appears in the
+    # file verbatim: ASCII (so bytes.lower() agrees) and nothing JSON escapes.
+    needle = None
+    if query and query.isascii() and query.isprintable() and '"' not in query and "\\" not in query:
+        needle = query.encode()
+
+    lines = iter_lines(HISTORY_FILE) if needle is None else iter_matching_lines(HISTORY_FILE, needle)
+    matches = []
+    for line in lines:
+        try:
+            entry = orjson.loads(line)
+        except orjson.JSONDecodeError:
+            continue
+        if query in entry.get("display", "").lower():
+            matches.append(entry)
+    return matches
+
+
+def read_json(path: Path):
+    """Load a JSON file, reusing the parsed result while its mtime is unchanged"""
+    try:
+        mtime_ns = path.stat().st_mtime_ns
+    except FileNotFoundError:
+        return None
+    return _read_json(path, mtime_ns)
+
+
+@lru_cache(maxsize=512)
+def _read_json(path: Path, mtime_ns: int):
+    """Parse a JSON file, memoized on mtime"""
+    return orjson.loads(path.read_bytes())
 
 
 def load_stats():
     """Load usage statistics"""
-    if not STATS_FILE.exists():
-        return None
-    with open(STATS_FILE) as f:
-        return json.load(f)
+    return read_json(STATS_FILE)
+
+
+def load_sessions_index(project_dir: Path):
+    """Load session entries from a project's sessions-index.json"""
+    index = read_json(project_dir / "sessions-index.json")
+    return index.get("entries", []) if index else []
+
+
+def summarize_project(project_dir: Path, entries):
+    """Build a project's listing fields from its session entries"""
+    # Get project path from first session
+    project_path = entries[0].get("projectPath", project_dir.name)
+    last_modified = ""
+    for e in entries:
+        modified = e.get("modified", "")
+        if modified > last_modified:
+            last_modified = modified
+    return {
+        "id": project_dir.name,
+        "path": project_path,
+        "name": Path(project_path).name if project_path else project_dir.name,
+        "session_count": len(entries),
+        "last_modified": last_modified
+    }
 
 
-def get_projects():
-    """Get all project directories with metadata"""
+def list_projects():
+    """Get project summaries (no session entries), newest first"""
     if not PROJECTS_DIR.exists():
         return []
 
+    with os.scandir(PROJECTS_DIR) as it:
+        dirs = [Path(entry.path) for entry in it if entry.is_dir()]
+
+    # Only re-read a sessions-index.json whose mtime or size changed since the last run
+    cache = load_cache(PROJECTS_CACHE_FILE)
+    summaries = {}
     projects = []
-    for d in PROJECTS_DIR.iterdir():
-        if not d.is_dir():
+    for d in dirs:
+        try:
+            st = (d / "sessions-index.json").stat()
+        except FileNotFoundError:
             continue
-        index_file = d / "sessions-index.json"
-        if index_file.exists():
-            with open(index_file) as f:
-                data = json.load(f)
-                entries = data.get("entries", [])
-                if entries:
-                    # Get project path from first session
-                    project_path = entries[0].get("projectPath", d.name)
-                    projects.append({
-                        "id": d.name,
-                        "path": project_path,
-                        "name": Path(project_path).name if project_path else d.name,
-                        "sessions": entries,
-                        "session_count": len(entries),
-                        "last_modified": max(e.get("modified", "") for e in entries) if entries else ""
-                    })
+        key = str(d)
+        hit = cache.get(key)
+        if not hit or hit["mtime_ns"] != st.st_mtime_ns or hit.get("size") != st.st_size:
+            entries = load_sessions_index(d)
+            summary = summarize_project(d, entries) if entries else None
+            hit = {"mtime_ns": st.st_mtime_ns, "size": st.st_size, "summary": summary}
+        summaries[key] = hit
+        if hit["summary"]:
+            projects.append(hit["summary"])
+
+    if summaries != cache:
+        save_cache(PROJECTS_CACHE_FILE, summaries)
 
     # Sort by last modified
-    projects.sort(key=lambda p: p["last_modified"], reverse=True)
+    projects.sort(key=itemgetter("last_modified"), reverse=True)
+    return projects
+
+
+def get_projects():
+    """Get all project directories with metadata"""
+    projects = list_projects()
+    for p in projects:
+        p["sessions"] = load_sessions_index(PROJECTS_DIR / p["id"])
     return projects
 
 
@@ -79,40 +247,143 @@ def load_session(session_path: Path):
     """Load a full session conversation"""
     if not session_path.exists():
         return []
-    messages = []
-    with open(session_path) as f:
-        for line in f:
-            try:
-                messages.append(json.loads(line))
-            except json.JSONDecodeError:
-                continue
-    return messages
+    return list(iter_jsonl(session_path, iter_chunked_lines))
+
+
+def _scan_session_dir(project_dir: str):
+    """List main session transcripts in one project directory"""
+    with os.scandir(project_dir) as files:
+        return [
+            Path(entry.path) for entry in files
+            if entry.name.endswith(".jsonl") and not entry.name.startswith("agent-")
+        ]
+
+
+def session_files(jobs=None):
+    """List main session transcripts across all projects (sub-agent files excluded)"""
+    if not PROJECTS_DIR.exists():
+        return []
+
+    # scandir entries carry their file type, so no extra stat per entry
+    with os.scandir(PROJECTS_DIR) as projects:
+        dirs = [project.path for project in projects if project.is_dir()]
+
+    # Directory listing is metadata IO that releases the GIL; overlap it on a cold cache
+    from concurrent.futures import ThreadPoolExecutor
+    with ThreadPoolExecutor(max_workers=jobs) as pool:
+        return [path for paths in pool.map(_scan_session_dir, dirs) for path in paths]
+
+
+def find_session_dir(session_id):
+    """Locate a session's project directory through the cached session index"""
+    if not PROJECTS_DIR.exists():
+        return None
+
+    mtime_ns = PROJECTS_DIR.stat().st_mtime_ns
+    cache = load_cache(SESSION_INDEX_FILE)
+    if cache.get("mtime_ns") == mtime_ns:
+        hit = cache["sessions"].get(session_id)
+        if hit and os.path.exists(os.path.join(hit, f"{session_id}.jsonl")):
+            return Path(hit)
+
+    # New sessions inside an existing project don't touch PROJECTS_DIR's
+    # mtime, so a miss also triggers a rebuild
+    from src.claude_sessions_explorer.session_index import build_session_index
+    sessions = build_session_index(PROJECTS_DIR)
+    save_cache(SESSION_INDEX_FILE, {"mtime_ns": mtime_ns, "sessions": sessions})
+    hit = sessions.get(session_id)
+    return Path(hit) if hit else None
+
+
+def count_tools(session_path: Path):
+    """Count tool_use blocks in a session, one message at a time"""
+    names = []
+    add = names.append
+    for line in iter_chunked_lines(session_path):
+        # Any line holding a tool_use block has this string verbatim; skip
+        # parsing the rest (prompts, plain text replies, tool results)
+        if b'"tool_use"' not in line:
+            continue
+        try:
+            msg = orjson.loads(line)
+        except orjson.JSONDecodeError:
+            continue
+        content = msg.get("message", {}).get("content")
+        # orjson only produces exact dicts/lists, so exact type checks suffice
+        if type(content) is not list:
+            continue
+        for block in content:
+            if type(block) is dict and block.get("type") == "tool_use":
+                add(block.get("name", "unknown"))
+    # Tally in one call; Counter(iterable) does the counting loop in C
+    return Counter(names)
 
 
 def load_commits(session_path: Path):
     """Load commits for a session"""
-    commits_path = session_path.with_suffix(".commits.json")
-    if not commits_path.exists():
-        return []
-    with open(commits_path) as f:
-        return json.load(f)
+    commits = read_json(session_path.with_suffix(".commits.json"))
+    return commits if commits is not None else []
+
+
+def extracted_session_ids(data_dir: Path):
+    """Collect the IDs of sessions with a saved extraction under data_dir/<project>/"""
+    existing = set()
+    if not data_dir.exists():
+        return existing
+    with os.scandir(data_dir) as projects:
+        dirs = [project.path for project in projects if project.is_dir()]
+    for project_dir in dirs:
+        with os.scandir(project_dir) as files:
+            existing.update(entry.name[:-5] for entry in files if entry.name.endswith(".json"))
+    return existing
+
+
+# ============ Caching ============
+
+def load_cache(path: Path):
+    """Load a JSON cache file, treating a missing or corrupt file as empty"""
+    try:
+        with open(path, "rb") as f:
+            return orjson.loads(f.read())
+    except (OSError, orjson.JSONDecodeError):
+        return {}
+
+
+def save_cache(path: Path, data):
+    """Write a JSON cache file atomically (best-effort, errors are ignored)"""
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(f"{path.name}.tmp.{os.getpid()}")
+        tmp.write_bytes(orjson.dumps(data))
+        os.replace(tmp, path)
+    except OSError:
+        pass
 
 
 # ============ Formatting ============
 
+DATE_FORMAT = "%Y-%m-%d %H:%M"
+
+
+@lru_cache(maxsize=4096)
 def format_date(iso_string):
     """Format ISO date string"""
+    # "YYYY-MM-DDTHH:MM..." already holds the wanted fields; slice instead of parsing
+    if (iso_string and len(iso_string) >= 16 and iso_string[10] in "T "
+            and iso_string[4] == iso_string[7] == "-" and iso_string[13] == ":"):
+        return f"{iso_string[:10]} {iso_string[11:16]}"
     try:
         dt = datetime.fromisoformat(iso_string.replace("Z", "+00:00"))
-        return dt.strftime("%Y-%m-%d %H:%M")
+        return dt.strftime(DATE_FORMAT)
     except:
         return iso_string[:16] if iso_string else "unknown"
 
 
+@lru_cache(maxsize=4096)
 def format_timestamp(ts):
     """Format millisecond timestamp"""
     try:
-        return datetime.fromtimestamp(ts / 1000).strftime("%Y-%m-%d %H:%M")
+        return datetime.fromtimestamp(ts / 1000).strftime(DATE_FORMAT)
     except:
         return "unknown"
 
@@ -121,25 +392,32 @@ def truncate(text, length=80):
     """Truncate text to length"""
     if not text:
         return ""
+    # Short single-line text (the common case) only needs trimming
+    if len(text) <= length and "\n" not in text:
+        return text.strip()
     text = text.replace("\n", " ").strip()
     return text[:length] + "..." if len(text) > length else text
 
 
 def print_table(headers, rows, widths=None):
     """Print a simple table"""
+    # Stringify each cell once; widths then come from one pass over the columns
+    cells = [[str(c) for c in row] for row in rows]
     if not widths:
-        widths = [max(len(str(row[i])) for row in [headers] + rows) for i in range(len(headers))]
+        widths = [max(map(len, col)) for col in zip(headers, *cells)]
 
     # Header
     header_line = "  ".join(h.ljust(w) for h, w in zip(headers, widths))
-    print(f"\n  {header_line}")
-    print(f"  {'-' * len(header_line)}")
+    out = [f"\n  {header_line}\n", f"  {'-' * len(header_line)}\n"]
 
     # Rows
-    for row in rows:
-        row_line = "  ".join(str(c).ljust(w)[:w] for c, w in zip(row, widths))
-        print(f"  {row_line}")
-    print()
+    for row in cells:
+        row_line = "  ".join(c.ljust(w)[:w] for c, w in zip(row, widths))
+        out.append(f"  {row_line}\n")
+    out.append("\n")
+
+    # One write instead of a print() per row
+    sys.stdout.write("".join(out))
 
 
 # ============ Commands ============
@@ -147,8 +425,7 @@ def print_table(headers, rows, widths=None):
 def cmd_stats(args):
     """Show overview statistics"""
     stats = load_stats()
-    projects = get_projects()
-    history = load_history()
+    projects = list_projects()
 
     print("\n  Claude Code Sessions")
     print("  " + "=" * 40)
@@ -159,21 +436,23 @@ def cmd_stats(args):
 
         # Token usage
         model_usage = stats.get("modelUsage", {})
-        total_input = sum(m.get("inputTokens", 0) for m in model_usage.values())
-        total_output = sum(m.get("outputTokens", 0) for m in model_usage.values())
+        total_input = total_output = 0
+        for m in model_usage.values():
+            total_input += m.get("inputTokens", 0)
+            total_output += m.get("outputTokens", 0)
         print(f"  Tokens:       {total_input + total_output:,} ({total_input:,} in / {total_output:,} out)")
 
         if stats.get("firstSessionDate"):
             print(f"  First:        {format_date(stats['firstSessionDate'])}")
 
     print(f"  Projects:     {len(projects)}")
-    print(f"  Prompts:      {len(history)}")
+    print(f"  Prompts:      {count_history()}")
     print()
 
 
 def cmd_projects(args):
     """List all projects"""
-    projects = get_projects()
+    projects = list_projects()
 
     if not projects:
         print("\n  No projects found.\n")
@@ -197,7 +476,7 @@ def cmd_projects(args):
 
 def cmd_sessions(args):
     """List sessions, optionally filtered by project"""
-    projects = get_projects()
+    projects = list_projects()
 
     if args.project:
         # Filter by project name
@@ -209,12 +488,15 @@ def cmd_sessions(args):
         return
 
     limit = args.limit or 20
+    out = []
 
     for p in projects[:5]:  # Show max 5 projects
-        print(f"\n  {p['name']} ({p['session_count']} sessions)")
-        print("  " + "-" * 50)
+        out.append(f"\n  {p['name']} ({p['session_count']} sessions)\n")
+        out.append("  " + "-" * 50 + "\n")
 
-        sessions = sorted(p["sessions"], key=lambda s: s.get("modified", ""), reverse=True)
+        # Only the projects shown need their session entries
+        entries = load_sessions_index(PROJECTS_DIR / p["id"])
+        sessions = sorted(entries, key=lambda s: s.get("modified", ""), reverse=True)
 
         for s in sessions[:limit]:
             date = format_date(s.get("modified", ""))
@@ -223,42 +505,35 @@ def cmd_sessions(args):
             branch = s.get("gitBranch", "")
 
             branch_str = f" [{branch}]" if branch else ""
-            print(f"  {date}  {msgs:3d} msgs  {prompt}{branch_str}")
+            out.append(f"  {date}  {msgs:3d} msgs  {prompt}{branch_str}\n")
 
-    print()
+    out.append("\n")
+    sys.stdout.write("".join(out))
 
 
 def cmd_search(args):
     """Search prompts and sessions"""
-    query = args.query.lower()
-    history = load_history()
-
-    # Search in history
-    matches = []
-    for entry in history:
-        display = entry.get("display", "")
-        if query in display.lower():
-            matches.append(entry)
+    matches = search_history(args.query.lower())
 
     if not matches:
         print(f"\n  No matches found for '{args.query}'.\n")
         return
 
-    print(f"\n  Found {len(matches)} matches for '{args.query}'")
-    print("  " + "=" * 50)
+    out = [f"\n  Found {len(matches)} matches for '{args.query}'\n", "  " + "=" * 50 + "\n"]
 
-    # Show recent matches
-    matches.sort(key=lambda e: e.get("timestamp", 0), reverse=True)
+    # Show recent matches; only the shown ones have their timestamp formatted
+    recent = nlargest(args.limit or 20, matches, key=lambda e: e.get("timestamp", 0))
 
-    for entry in matches[:args.limit or 20]:
+    for entry in recent:
         date = format_timestamp(entry.get("timestamp", 0))
         project = Path(entry.get("project", "unknown")).name
         display = truncate(entry.get("display", ""), 60)
 
-        print(f"\n  [{date}] {project}")
-        print(f"    {display}")
+        out.append(f"\n  [{date}] {project}\n")
+        out.append(f"    {display}\n")
 
-    print()
+    out.append("\n")
+    sys.stdout.write("".join(out))
 
 
 def cmd_show(args):
@@ -266,126 +541,152 @@ def cmd_show(args):
     session_id = args.session_id
 
     # Find the session
-    for project_dir in PROJECTS_DIR.iterdir():
-        if not project_dir.is_dir():
+    project_dir = find_session_dir(session_id)
+    if project_dir is None:
+        print(f"\n  Session '{session_id}' not found.\n")
+        return
+
+    session_path = project_dir / f"{session_id}.jsonl"
+    messages = load_session(session_path)
+    commits = load_commits(session_path)
+
+    # Get session metadata
+    session_meta = None
+    for entry in load_sessions_index(project_dir):
+        if entry.get("sessionId") == session_id:
+            session_meta = entry
+            break
+
+    # Print header
+    print(f"\n  Session: {session_id}")
+    if session_meta:
+        print(f"  Created: {format_date(session_meta.get('created', ''))}")
+        print(f"  Messages: {session_meta.get('messageCount', len(messages))}")
+        if session_meta.get("gitBranch"):
+            print(f"  Branch: {session_meta['gitBranch']}")
+
+    # Print commits
+    if commits:
+        print(f"\n  Commits ({len(commits)}):")
+        for c in commits:
+            repo = c.get("repoUrl", "").replace("https://github.com/", "").replace(".git", "")
+            print(f"    {c['commitHash']} [{c['branch']}] {repo}")
+
+    # Print messages
+    print(f"\n  Conversation:")
+    print("  " + "-" * 50)
+
+    for msg in messages:
+        if msg.get("isMeta"):
             continue
 
-        session_path = project_dir / f"{session_id}.jsonl"
-        if session_path.exists():
-            messages = load_session(session_path)
-            commits = load_commits(session_path)
-
-            # Get session metadata
-            index_file = project_dir / "sessions-index.json"
-            session_meta = None
-            if index_file.exists():
-                with open(index_file) as f:
-                    data = json.load(f)
-                    for entry in data.get("entries", []):
-                        if entry.get("sessionId") == session_id:
-                            session_meta = entry
-                            break
-
-            # Print header
-            print(f"\n  Session: {session_id}")
-            if session_meta:
-                print(f"  Created: {format_date(session_meta.get('created', ''))}")
-                print(f"  Messages: {session_meta.get('messageCount', len(messages))}")
-                if session_meta.get("gitBranch"):
-                    print(f"  Branch: {session_meta['gitBranch']}")
-
-            # Print commits
-            if commits:
-                print(f"\n  Commits ({len(commits)}):")
-                for c in commits:
-                    repo = c.get("repoUrl", "").replace("https://github.com/", "").replace(".git", "")
-                    print(f"    {c['commitHash']} [{c['branch']}] {repo}")
-
-            # Print messages
-            print(f"\n  Conversation:")
-            print("  " + "-" * 50)
-
-            for msg in messages:
-                if msg.get("isMeta"):
-                    continue
-
-                role = msg.get("type", "unknown")
-                content = msg.get("message", {}).get("content", "")
-
-                if isinstance(content, list):
-                    # Extract text content
-                    texts = []
-                    tools = []
-                    for block in content:
-                        if isinstance(block, dict):
-                            if block.get("type") == "text":
-                                texts.append(block.get("text", ""))
-                            elif block.get("type") == "tool_use":
-                                tools.append(block.get("name", "tool"))
-                    content = " ".join(texts)
-                    if tools and not content:
-                        content = f"[Tools: {', '.join(tools)}]"
-
-                if not content or not content.strip():
-                    continue
-
-                label = "You" if role == "user" else "Claude"
-                text = truncate(content, 100) if not args.full else content[:500]
-
-                print(f"\n  {label}:")
-                print(f"    {text}")
-
-            print()
-            return
+        role = msg.get("type", "unknown")
+        content = msg.get("message", {}).get("content", "")
+
+        if isinstance(content, list):
+            # Extract text content
+            texts = []
+            tools = []
+            for block in content:
+                if isinstance(block, dict):
+                    if block.get("type") == "text":
+                        texts.append(block.get("text", ""))
+                    elif block.get("type") == "tool_use":
+                        tools.append(block.get("name", "tool"))
+            content = " ".join(texts)
+            if tools and not content:
+                content = f"[Tools: {', '.join(tools)}]"
+
+        if not content or not content.strip():
+            continue
+
+        label = "You" if role == "user" else "Claude"
+        text = truncate(content, 100) if not args.full else content[:500]
 
-    print(f"\n  Session '{session_id}' not found.\n")
+        print(f"\n  {label}:")
+        print(f"    {text}")
+
+    print()
 
 
 def cmd_tools(args):
     """Show tool usage statistics"""
-    all_tools = Counter()
-    session_count = 0
+    paths = session_files(args.jobs)
+
+    # Reuse per-session counts for files unchanged since the last run
+    cache = load_cache(TOOLS_CACHE_FILE)
+    counts = {}
+    stale = []
+    for path in paths:
+        st = path.stat()
+        key = str(path)
+        hit = cache.get(key)
+        if hit and hit["mtime_ns"] == st.st_mtime_ns and hit["size"] == st.st_size:
+            counts[key] = hit
+        else:
+            stale.append((key, st))
 
-    for project_dir in PROJECTS_DIR.iterdir():
-        if not project_dir.is_dir():
-            continue
+    stale_paths = [Path(key) for key, _ in stale]
+    if len(stale_paths) < POOL_MIN_FILES:
+        # A warm cache usually leaves only the active session stale; starting a pool costs more
+        results = list(map(count_tools, stale_paths))
+    else:
+        # Parsing is CPU-bound, so fan a cold cache out across processes
+        from concurrent.futures import ProcessPoolExecutor
+        workers = min(args.jobs or os.cpu_count() or 1, len(stale_paths))
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            results = list(pool.map(count_tools, stale_paths, chunksize=8))
+    for (key, st), tools in zip(stale, results):
+        counts[key] = {"mtime_ns": st.st_mtime_ns, "size": st.st_size, "tools": tools}
+
+    # Merge into a plain dict; Counter.update loops in Python with extra dispatch
+    all_tools = {}
+    get = all_tools.get
+    for entry in counts.values():
+        for tool, n in entry["tools"].items():
+            all_tools[tool] = get(tool, 0) + n
+
+    # Rewrite when anything was recounted or a session disappeared
+    if stale or len(counts) != len(cache):
+        save_cache(TOOLS_CACHE_FILE, counts)
+
+    print(f"\n  Tool Usage (across {len(paths)} sessions)")
+    print("  " + "=" * 40)
 
-        for session_file in project_dir.glob("*.jsonl"):
-            if session_file.name.startswith("agent-"):
-                continue
+    top = nlargest(20, all_tools.items(), key=itemgetter(1))
+    rows = [[tool, str(count)] for tool, count in top]
+    print_table(["Tool", "Uses"], rows, [25, 10])
 
-            session_count += 1
-            messages = load_session(session_file)
 
-            for msg in messages:
-                content = msg.get("message", {}).get("content", [])
-                if isinstance(content, list):
-                    for block in content:
-                        if isinstance(block, dict) and block.get("type") == "tool_use":
-                            all_tools[block.get("name", "unknown")] += 1
+def _scan_commit_files(project_dir: str):
+    """List the *.commits.json files in one project directory"""
+    with os.scandir(project_dir) as files:
+        return [entry.path for entry in files if entry.name.endswith(".commits.json")]
 
-    print(f"\n  Tool Usage (across {session_count} sessions)")
-    print("  " + "=" * 40)
 
-    rows = [[tool, str(count)] for tool, count in all_tools.most_common(20)]
-    print_table(["Tool", "Uses"], rows, [25, 10])
+def read_commits_file(path: str):
+    """Load a commits file, tagging each commit with its session ID"""
+    commits_file = Path(path)
+    session_id = commits_file.stem
+    commits = orjson.loads(commits_file.read_bytes())
+    for c in commits:
+        c["session_id"] = session_id
+    return commits
 
 
 def cmd_commits(args):
     """List all tracked commits"""
     all_commits = []
 
-    for project_dir in PROJECTS_DIR.iterdir():
-        if not project_dir.is_dir():
-            continue
+    with os.scandir(PROJECTS_DIR) as projects:
+        dirs = [project.path for project in projects if project.is_dir()]
 
-        for commits_file in project_dir.glob("*.commits.json"):
-            session_id = commits_file.stem
-            with open(commits_file) as f:
-                commits = json.load(f)
-                for c in commits:
-                    c["session_id"] = session_id
-                    all_commits.append(c)
+    # Many small files: overlap the listing and read syscalls across threads
+    from concurrent.futures import ThreadPoolExecutor
+    with ThreadPoolExecutor() as pool:
+        files = [path for paths in pool.map(_scan_commit_files, dirs) for path in paths]
+        for commits in pool.map(read_commits_file, files):
+            all_commits.extend(commits)
 
     if not all_commits:
         print("\n  No commits tracked yet.")
@@ -409,40 +710,101 @@ def cmd_commits(args):
     print()
 
 
-def cmd_export(args):
-    """Export all data to JSON"""
-    data = {
-        "exported_at": datetime.now().isoformat(),
-        "stats": load_stats(),
-        "history": load_history(),
-        "projects": []
-    }
+def _encode(obj, depth=0, pretty=False):
+    """Encode obj with orjson, indented to sit at the given depth when pretty"""
+    if not pretty:
+        return orjson.dumps(obj)
+    return orjson.dumps(obj, option=orjson.OPT_INDENT_2).replace(b"\n", b"\n" + b"  " * depth)
 
-    for p in get_projects():
-        project_data = {
-            "id": p["id"],
-            "name": p["name"],
-            "path": p["path"],
-            "sessions": []
-        }
 
-        for s in p["sessions"]:
-            session_path = Path(s.get("fullPath", ""))
-            session_data = {
-                "metadata": s,
-                "commits": load_commits(session_path) if session_path.exists() else []
-            }
+def _newline(depth, pretty):
+    """Line break plus indentation for pretty output, nothing otherwise"""
+    return b"\n" + b"  " * depth if pretty else b""
+
+
+def _json_key(name, depth, pretty, first=False):
+    """Encode an object key (with its leading comma unless first)"""
+    sep = b"" if first else b","
+    return sep + _newline(depth, pretty) + orjson.dumps(name) + (b": " if pretty else b":")
 
-            if args.full:
-                session_data["messages"] = load_session(session_path)
 
-            project_data["sessions"].append(session_data)
+def write_json_array(f, items, depth=0, pretty=False):
+    """Write an iterable to a binary file as a JSON array, one item at a time"""
+    f.write(b"[")
+    empty = True
+    for item in items:
+        f.write((b"" if empty else b",") + _newline(depth + 1, pretty))
+        f.write(_encode(item, depth + 1, pretty))
+        empty = False
+    f.write(b"]" if empty else _newline(depth, pretty) + b"]")
 
-        data["projects"].append(project_data)
 
+def load_session_fragment(session_path: Path):
+    """Load a session as a pre-encoded JSON array of its raw lines"""
+    if not session_path.exists():
+        return orjson.Fragment(b"[]")
+    lines = []
+    for line in iter_chunked_lines(session_path):
+        # Parse only to validate; the line's own bytes are what gets written
+        try:
+            orjson.loads(line)
+        except orjson.JSONDecodeError:
+            continue
+        lines.append(line)
+    return orjson.Fragment(b"[" + b",".join(lines) + b"]")
+
+
+def iter_export_sessions(project, full=False, raw=False):
+    """Yield export records for a project's sessions, loading one at a time"""
+    for s in project["sessions"]:
+        session_path = Path(s.get("fullPath", ""))
+        session_data = {
+            "metadata": s,
+            "commits": load_commits(session_path) if session_path.exists() else []
+        }
+
+        if full:
+            session_data["messages"] = load_session_fragment(session_path) if raw else load_session(session_path)
+
+        yield session_data
+
+
+def cmd_export(args):
+    """Export all data to JSON"""
     output = Path(args.output)
-    with open(output, "w") as f:
-        json.dump(data, f, indent=2)
+    pretty = args.pretty
+
+    # JSON compresses well, so a .gz target trades a little CPU for far fewer bytes on disk
+    if output.suffix == ".gz":
+        import gzip
+        out = gzip.open(output, "wb", compresslevel=3)
+    else:
+        out = open(output, "wb")
+
+    # Stream the document out piece by piece so only one session's
+    # messages are held in memory at a time
+    with out as f:
+        f.write(b"{" + _json_key("exported_at", 1, pretty, first=True))
+        f.write(_encode(datetime.now().isoformat()))
+        f.write(_json_key("stats", 1, pretty) + _encode(load_stats(), 1, pretty))
+        f.write(_json_key("history", 1, pretty))
+        write_json_array(f, iter_history(), 1, pretty)
+        f.write(_json_key("projects", 1, pretty) + b"[")
+
+        count = 0
+        for p in get_projects():
+            f.write((b"," if count else b"") + _newline(2, pretty) + b"{")
+            f.write(_json_key("id", 3, pretty, first=True) + _encode(p["id"]))
+            f.write(_json_key("name", 3, pretty) + _encode(p["name"]))
+            f.write(_json_key("path", 3, pretty) + _encode(p["path"]))
+            f.write(_json_key("sessions", 3, pretty))
+            # Compact output can copy transcript lines through as-is; pretty output
+            # has to re-encode them to indent
+            write_json_array(f, iter_export_sessions(p, args.full, raw=not pretty), 3, pretty)
+            f.write(_newline(2, pretty) + b"}")
+            count += 1
+
+        f.write((_newline(1, pretty) if count else b"") + b"]" + _newline(0, pretty) + b"}")
 
     print(f"\n  Exported to {output}\n")
 
@@ -461,6 +823,7 @@ def cmd_open(args):
 
 def cmd_extract(args):
     """Extract learnings from a session"""
+    import asyncio
     from src.claude_sessions_explorer.memory import extract_from_session, save_extraction
 
     session_id = args.session_id
@@ -487,10 +850,37 @@ def cmd_extract(args):
         sys.exit(1)
 
 
+def extract_sessions(sessions, jobs):
+    """Extract and save sessions concurrently, reporting each as it finishes; returns the success count"""
+    import asyncio
+    from src.claude_sessions_explorer.memory import extract_many, save_extraction
+
+    total = len(sessions)
+
+    async def run_all():
+        # One event loop for the whole batch; extract_many bounds concurrent LLM calls
+        success = done = 0
+        pairs = [(s["session_id"], s["project"]) for s in sessions]
+        async for i, extraction in extract_many(pairs, jobs):
+            s = sessions[i]
+            done += 1
+            try:
+                if isinstance(extraction, Exception):
+                    raise extraction
+                await asyncio.to_thread(save_extraction, extraction)
+                result = f"{len(extraction.episodic)}e {len(extraction.semantic)}s {len(extraction.procedural)}p {len(extraction.decisions)}d {len(extraction.gotchas)}g"
+                success += 1
+            except Exception as e:
+                result = f"Error: {e}"
+            print(f"  [{done}/{total}] {s['project']}: {s['prompt'][:40]}...")
+            print(f"    -> {result}")
+        return success
+
+    return asyncio.run(run_all())
+
+
 def cmd_extract_all(args):
     """Extract learnings from all sessions for a project"""
-    from src.claude_sessions_explorer.memory import extract_from_session, save_extraction
-
     project_filter = args.project.lower() if args.project else None
     force = args.force
 
@@ -517,12 +907,7 @@ def cmd_extract_all(args):
 
     # Check for existing extractions
     data_dir = Path(".data/extractions")
-    existing = set()
-    if data_dir.exists() and not force:
-        for project_dir in data_dir.iterdir():
-            if project_dir.is_dir():
-                for f in project_dir.glob("*.json"):
-                    existing.add(f.stem)
+    existing = extracted_session_ids(data_dir) if not force else set()
 
     # Filter out sub-agent sessions (those starting with "## TASK")
     def is_real_session(s):
@@ -545,26 +930,15 @@ def cmd_extract_all(args):
 
     print(f"  Processing {len(sessions_to_process)} sessions...\n")
 
-    success = 0
-    failed = 0
-    for i, s in enumerate(sessions_to_process, 1):
-        session_id = s["session_id"]
-        print(f"  [{i}/{len(sessions_to_process)}] {s['project']}: {s['prompt'][:40]}...")
-
-        try:
-            extraction = asyncio.run(extract_from_session(session_id, s["project"]))
-            save_extraction(extraction)
-            print(f"    -> {len(extraction.episodic)}e {len(extraction.semantic)}s {len(extraction.procedural)}p {len(extraction.decisions)}d {len(extraction.gotchas)}g")
-            success += 1
-        except Exception as e:
-            print(f"    -> Error: {e}")
-            failed += 1
+    success = extract_sessions(sessions_to_process, args.jobs)
+    failed = len(sessions_to_process) - success
 
     print(f"\n  Done: {success} extracted, {failed} failed\n")
 
 
 def cmd_consolidate(args):
     """Consolidate extractions into project memory"""
+    import asyncio
     from src.claude_sessions_explorer.memory import (
         consolidate_project,
         save_project_memory,
@@ -613,6 +987,7 @@ def cmd_consolidate(args):
 
 def cmd_generate(args):
     """Generate CLAUDE.md and skills from project memory"""
+    import asyncio
     from src.claude_sessions_explorer.memory import generate_all, load_project_memory
 
     project = args.project
@@ -625,7 +1000,8 @@ def cmd_generate(args):
         if not memory_dir.exists():
             print("\n  No consolidated memories found. Run 'consolidate' first.\n")
             return
-        projects = [d.name for d in memory_dir.iterdir() if d.is_dir()]
+        with os.scandir(memory_dir) as it:
+            projects = [d.name for d in it if d.is_dir()]
         if not projects:
             print("\n  No consolidated memories found. Run 'consolidate' first.\n")
             return
@@ -694,9 +1070,8 @@ def cmd_generate(args):
 
 def cmd_learn(args):
     """All-in-one: extract + consolidate + generate"""
+    import asyncio
     from src.claude_sessions_explorer.memory import (
-        extract_from_session,
-        save_extraction,
         consolidate_project,
         save_project_memory,
         generate_all,
@@ -733,24 +1108,13 @@ def cmd_learn(args):
             })
 
     data_dir = Path(".data/extractions")
-    existing = set()
-    if data_dir.exists():
-        for project_dir in data_dir.iterdir():
-            if project_dir.is_dir():
-                for f in project_dir.glob("*.json"):
-                    existing.add(f.stem)
+    existing = extracted_session_ids(data_dir)
 
     sessions_to_process = [s for s in all_sessions if s["session_id"] not in existing]
 
     if sessions_to_process:
         print(f"  Processing {len(sessions_to_process)} new sessions...")
-        for i, s in enumerate(sessions_to_process, 1):
-            try:
-                extraction = asyncio.run(extract_from_session(s["session_id"], project_name))
-                save_extraction(extraction)
-                print(f"    [{i}/{len(sessions_to_process)}] Extracted")
-            except Exception as e:
-                print(f"    [{i}/{len(sessions_to_process)}] Failed: {e}")
+        extract_sessions(sessions_to_process, args.jobs)
     else:
         print(f"  All {len(all_sessions)} sessions already extracted.")
 
@@ -767,7 +1131,8 @@ def cmd_learn(args):
     # Step 3: Generate
     print("\n  Step 3: Generating outputs...")
     try:
-        result = asyncio.run(generate_all(project_name, use_llm=use_llm))
+        # Reuse the memory just consolidated rather than reading it back from disk
+        result = asyncio.run(generate_all(project_name, use_llm=use_llm, memory=memory))
         print(f"  Generated CLAUDE.md and {len(result['skills'])} skills")
     except Exception as e:
         print(f"  Generation failed: {e}")
@@ -790,7 +1155,7 @@ def cmd_apply(args):
 
     # Find project path if not specified
     if not target:
-        projects = get_projects()
+        projects = list_projects()
         matching = [p for p in projects if project.lower() in p["name"].lower()]
         if matching:
             target = Path(matching[0]["path"])
@@ -821,6 +1186,7 @@ def cmd_apply(args):
 
 def cmd_query(args):
     """Query project memory"""
+    import asyncio
     from src.claude_sessions_explorer.memory import query_memory
 
     project = args.project
@@ -848,6 +1214,14 @@ def cmd_query(args):
 
 # ============ Main ============
 
+def positive_int(value):
+    """argparse type for worker counts, which must be at least 1"""
+    n = int(value)
+    if n < 1:
+        raise argparse.ArgumentTypeError(f"must be at least 1, got {value}")
+    return n
+
+
 def main():
     parser = argparse.ArgumentParser(
         description="Claude Sessions Explorer - Browse your Claude Code history",
@@ -863,6 +1237,7 @@ Examples:
   %(prog)s tools                Tool usage statistics
   %(prog)s commits              List tracked commits
   %(prog)s export data.json     Export all data
+  %(prog)s export data.json.gz  Export all data, gzip-compressed
   %(prog)s open                 Open web UI
 
 Memory/Learning Commands:
@@ -900,7 +1275,8 @@ Memory/Learning Commands:
     p.add_argument("-f", "--full", action="store_true", help="Show full content")
 
     # tools
-    subparsers.add_parser("tools", help="Tool usage statistics")
+    p = subparsers.add_parser("tools", help="Tool usage statistics")
+    p.add_argument("-j", "--jobs", type=positive_int, help="Worker count for scanning and parsing")
 
     # commits
     p = subparsers.add_parser("commits", help="List tracked commits")
@@ -910,6 +1286,7 @@ Memory/Learning Commands:
     p = subparsers.add_parser("export", help="Export data to JSON")
     p.add_argument("output", help="Output file path")
     p.add_argument("-f", "--full", action="store_true", help="Include full messages")
+    p.add_argument("--pretty", action="store_true", help="Indent the JSON output")
 
     # open
     p = subparsers.add_parser("open", help="Open web UI")
@@ -923,6 +1300,7 @@ Memory/Learning Commands:
     p = subparsers.add_parser("extract-all", help="Extract learnings from all sessions")
     p.add_argument("-p", "--project", help="Filter by project name")
     p.add_argument("-f", "--force", action="store_true", help="Re-extract existing sessions")
+    p.add_argument("-j", "--jobs", type=positive_int, default=8, help="Sessions to extract concurrently")
 
     # consolidate
     p = subparsers.add_parser("consolidate", help="Consolidate extractions into project memory")
@@ -939,6 +1317,7 @@ Memory/Learning Commands:
     p = subparsers.add_parser("learn", help="All-in-one: extract + consolidate + generate")
     p.add_argument("-p", "--project", required=True, help="Project name")
     p.add_argument("-s", "--simple", action="store_true", help="Use simple mode (no LLM)")
+    p.add_argument("-j", "--jobs", type=positive_int, default=8, help="Sessions to extract concurrently")
 
     # apply
     p = subparsers.add_parser("apply", help="Apply generated files to project")
@@ -1,23 +1,26 @@
 """Claude Sessions Explorer - Browse and extract learnings from Claude Code sessions."""
 
-from .models import (
-    EpisodicMemory,
-    SemanticMemory,
-    ProceduralMemory,
-    Decision,
-    Gotcha,
-    SessionExtraction,
-)
-from .memory import extract_from_session, save_extraction, load_session_trace
+from importlib import import_module
 
-__all__ = [
-    "EpisodicMemory",
-    "SemanticMemory",
-    "ProceduralMemory",
-    "Decision",
-    "Gotcha",
-    "SessionExtraction",
-    "extract_from_session",
-    "save_extraction",
-    "load_session_trace",
-]
+# Exports resolve on first use (PEP 562), so importing a light submodule such as
+# session_index does not load pydantic or the Agent SDK
+_EXPORTS = {
+    "EpisodicMemory": "models",
+    "SemanticMemory": "models",
+    "ProceduralMemory": "models",
+    "Decision": "models",
+    "Gotcha": "models",
+    "SessionExtraction": "models",
+    "extract_from_session": "memory",
+    "save_extraction": "memory",
+    "load_session_trace": "memory",
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name: str):
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    return getattr(import_module(f".{module}", __name__), name)
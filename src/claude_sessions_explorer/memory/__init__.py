@@ -1,6 +1,6 @@
 """Memory extraction and consolidation from Claude Code sessions."""
 
-from .extractor import extract_from_session, save_extraction, load_session_trace
+from .extractor import extract_from_session, extract_many, save_extraction, load_session_trace
 from .consolidator import (
     consolidate_project,
     save_project_memory,
@@ -19,6 +19,7 @@ from .generator import (
 
 __all__ = [
     "extract_from_session",
+    "extract_many",
     "save_extraction",
     "load_session_trace",
     "consolidate_project",
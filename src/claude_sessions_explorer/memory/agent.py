@@ -0,0 +1,86 @@
+"""Run Claude Agent SDK queries and collect their text responses."""
+
+import re
+
+from claude_agent_sdk import query, ClaudeAgentOptions
+from claude_agent_sdk.types import AssistantMessage, ResultMessage
+
+
+MAX_TURNS = 30  # Allow enough turns for thorough exploration and analysis
+
+# Characters that can change bracket depth or string state while scanning JSON
+_JSON_TOKEN_RE = re.compile(r'[\\"{}\[\]]')
+
+
+async def collect_response(prompt: str, system_prompt: str, max_turns: int = MAX_TURNS) -> str:
+    """Run a query and return its response text.
+
+    The final result replaces the streamed text when the SDK provides one.
+    """
+    parts: list[str] = []
+    async for msg in query(
+        prompt=prompt,
+        options=ClaudeAgentOptions(
+            max_turns=max_turns,
+            system_prompt=system_prompt
+        )
+    ):
+        if isinstance(msg, AssistantMessage):
+            for block in msg.content:
+                if hasattr(block, 'text'):
+                    parts.append(block.text)
+        elif isinstance(msg, ResultMessage) and msg.result:
+            parts = [msg.result]
+
+    return "".join(parts)
+
+
+def _json_value_end(text: str, start: int) -> int:
+    """Return the index just past the bracket matching the one at `start`, or -1."""
+    depth = 0
+    in_string = False
+    escaped = -1
+    for m in _JSON_TOKEN_RE.finditer(text, start):
+        i = m.start()
+        if i == escaped:
+            continue
+        c = text[i]
+        if in_string:
+            if c == "\\":
+                escaped = i + 1
+            elif c == '"':
+                in_string = False
+        elif c == '"':
+            in_string = True
+        elif c in "{[":
+            depth += 1
+        elif c in "}]":
+            depth -= 1
+            if depth == 0:
+                return i + 1
+    return -1
+
+
+def extract_fenced_json(text: str) -> str:
+    """Return the JSON in the first ```/```json fenced block, or the whole text if there is none.
+
+    An object or array is matched bracket by bracket, so fences inside its strings
+    (e.g. code samples in a skill) do not cut it short.
+    """
+    start = text.find("```")
+    if start == -1:
+        return text
+    body = start + 3
+    if text.startswith("json", body):
+        body += 4
+    value = body
+    while value < len(text) and text[value].isspace():
+        value += 1
+    if text.startswith(("{", "["), value):
+        end = _json_value_end(text, value)
+        if end != -1:
+            return text[value:end]
+    end = text.find("```", body)
+    if end == -1:
+        return text
+    return text[body:end]
@@ -1,22 +1,14 @@
 """Consolidate multiple session extractions into unified project memory."""
 
-import json
-import re
+import asyncio
+import os
 from datetime import datetime
 from pathlib import Path
 
-from claude_agent_sdk import query, ClaudeAgentOptions
-from claude_agent_sdk.types import AssistantMessage, ResultMessage
-
-from ..models import (
-    SessionExtraction,
-    ProjectMemory,
-    ConsolidatedEpisodic,
-    ConsolidatedSemantic,
-    ConsolidatedProcedural,
-    ConsolidatedDecision,
-    ConsolidatedGotcha,
-)
+import orjson
+
+from .agent import collect_response, extract_fenced_json
+from ..models import EXTRACTION_LIST_ADAPTER, SessionExtraction, ProjectMemory
 from ..prompts.consolidate import get_consolidation_prompt
 
 
@@ -31,9 +23,8 @@ def load_extractions(project: str) -> list[SessionExtraction]:
 
     extractions = []
     for f in extractions_dir.glob("*.json"):
-        with open(f) as fp:
-            data = json.load(fp)
-            extractions.append(SessionExtraction(**data))
+        # Validate straight from bytes; skips building an intermediate dict
+        extractions.append(SessionExtraction.model_validate_json(f.read_bytes()))
 
     return sorted(extractions, key=lambda e: e.extracted_at)
 
@@ -44,47 +35,26 @@ def get_all_projects() -> list[str]:
     if not extractions_dir.exists():
         return []
 
-    return [d.name for d in extractions_dir.iterdir() if d.is_dir()]
+    with os.scandir(extractions_dir) as it:
+        return [d.name for d in it if d.is_dir()]
 
 
 async def consolidate_with_llm(extractions: list[SessionExtraction], existing_memory: ProjectMemory | None = None) -> dict:
     """Use Claude to consolidate extractions intelligently."""
-    extractions_json = json.dumps(
-        [e.model_dump() for e in extractions],
-        indent=2
-    )
+    extractions_json = EXTRACTION_LIST_ADAPTER.dump_json(extractions, indent=2).decode()
 
     existing_memory_json = "None - this is the first consolidation."
     if existing_memory:
-        existing_memory_json = json.dumps(existing_memory.model_dump(), indent=2)
+        existing_memory_json = existing_memory.model_dump_json(indent=2)
 
     system_prompt, user_prompt = get_consolidation_prompt(extractions_json, existing_memory_json)
 
     # Enable tools so Claude can write code to analyze patterns, deduplicate, etc.
-    response_text = ""
-    async for msg in query(
-        prompt=user_prompt,
-        options=ClaudeAgentOptions(
-            max_turns=30,  # Allow many turns for thorough analysis and consolidation
-            system_prompt=system_prompt
-        )
-    ):
-        if isinstance(msg, AssistantMessage):
-            for block in msg.content:
-                if hasattr(block, 'text'):
-                    response_text += block.text
-        elif isinstance(msg, ResultMessage) and msg.result:
-            response_text = msg.result
-
-    json_match = re.search(r"```(?:json)?\s*([\s\S]*?)```", response_text)
-    if json_match:
-        json_str = json_match.group(1)
-    else:
-        json_str = response_text
+    response_text = await collect_response(user_prompt, system_prompt)
 
     try:
-        return json.loads(json_str)
-    except json.JSONDecodeError as e:
+        return orjson.loads(extract_fenced_json(response_text))
+    except orjson.JSONDecodeError as e:
         raise ValueError(f"Failed to parse consolidation response: {e}\nResponse: {response_text[:500]}")
 
 
@@ -97,27 +67,33 @@ def simple_consolidate(extractions: list[SessionExtraction]) -> dict:
     gotchas_map: dict[str, dict] = {}
 
     for ext in extractions:
+        session_id = ext.session_id
+        seen = ext.extracted_at[:10]
+
+        # One dict lookup per item: fetch the existing entry, or insert a new one
         for item in ext.episodic:
             key = item.incident.lower().strip()
-            if key in episodic_map:
-                episodic_map[key]["occurrences"] += 1
-                episodic_map[key]["sessions"].append(ext.session_id)
-                episodic_map[key]["last_seen"] = ext.extracted_at[:10]
+            entry = episodic_map.get(key)
+            if entry is not None:
+                entry["occurrences"] += 1
+                entry["sessions"].append(session_id)
+                entry["last_seen"] = seen
             else:
                 episodic_map[key] = {
                     "incident": item.incident,
                     "resolution": item.resolution,
                     "occurrences": 1,
-                    "sessions": [ext.session_id],
-                    "last_seen": ext.extracted_at[:10]
+                    "sessions": [session_id],
+                    "last_seen": seen
                 }
 
         for item in ext.semantic:
             key = item.knowledge.lower().strip()
-            if key in semantic_map:
-                semantic_map[key]["frequency"] += 1
-                if semantic_map[key]["frequency"] >= 3:
-                    semantic_map[key]["confidence"] = "high"
+            entry = semantic_map.get(key)
+            if entry is not None:
+                entry["frequency"] += 1
+                if entry["frequency"] >= 3:
+                    entry["confidence"] = "high"
             else:
                 semantic_map[key] = {
                     "knowledge": item.knowledge,
@@ -128,10 +104,11 @@ def simple_consolidate(extractions: list[SessionExtraction]) -> dict:
 
         for item in ext.procedural:
             key = item.workflow.lower().strip()
-            if key in procedural_map:
-                procedural_map[key]["times_used"] += 1
-                if len(item.steps) > len(procedural_map[key]["steps"]):
-                    procedural_map[key]["steps"] = item.steps
+            entry = procedural_map.get(key)
+            if entry is not None:
+                entry["times_used"] += 1
+                if len(item.steps) > len(entry["steps"]):
+                    entry["steps"] = item.steps
             else:
                 procedural_map[key] = {
                     "workflow": item.workflow,
@@ -147,14 +124,15 @@ def simple_consolidate(extractions: list[SessionExtraction]) -> dict:
                 "rationale": item.rationale,
                 "alternatives_considered": item.alternatives_considered,
                 "status": "active",
-                "date": item.date or ext.extracted_at[:10]
+                "date": item.date or seen
             }
 
         for item in ext.gotchas:
             key = item.issue.lower().strip()
-            if key in gotchas_map:
-                gotchas_map[key]["frequency"] += 1
-                gotchas_map[key]["tags"] = list(set(gotchas_map[key]["tags"] + item.tags))
+            entry = gotchas_map.get(key)
+            if entry is not None:
+                entry["frequency"] += 1
+                entry["tags"] = list(set(entry["tags"]).union(item.tags))
             else:
                 gotchas_map[key] = {
                     "issue": item.issue,
@@ -175,7 +153,7 @@ def simple_consolidate(extractions: list[SessionExtraction]) -> dict:
 
 async def consolidate_project(project: str, use_llm: bool = True) -> ProjectMemory:
     """Consolidate all extractions for a project into unified memory."""
-    extractions = load_extractions(project)
+    extractions = await asyncio.to_thread(load_extractions, project)
     if not extractions:
         raise ValueError(f"No extractions found for project: {project}")
 
@@ -186,17 +164,18 @@ async def consolidate_project(project: str, use_llm: bool = True) -> ProjectMemo
 
     last_extraction = max(extractions, key=lambda e: e.extracted_at)
 
-    return ProjectMemory(
-        project=project,
-        generated_at=datetime.now().isoformat(),
-        sessions_analyzed=len(extractions),
-        last_session=last_extraction.extracted_at,
-        episodic=[ConsolidatedEpisodic(**e) for e in data.get("episodic", [])],
-        semantic=[ConsolidatedSemantic(**s) for s in data.get("semantic", [])],
-        procedural=[ConsolidatedProcedural(**p) for p in data.get("procedural", [])],
-        decisions=[ConsolidatedDecision(**d) for d in data.get("decisions", [])],
-        gotchas=[ConsolidatedGotcha(**g) for g in data.get("gotchas", [])],
-    )
+    # Validate the whole document in one pydantic-core call rather than one model per item
+    return ProjectMemory.model_validate({
+        "project": project,
+        "generated_at": datetime.now().isoformat(),
+        "sessions_analyzed": len(extractions),
+        "last_session": last_extraction.extracted_at,
+        "episodic": data.get("episodic", []),
+        "semantic": data.get("semantic", []),
+        "procedural": data.get("procedural", []),
+        "decisions": data.get("decisions", []),
+        "gotchas": data.get("gotchas", []),
+    })
 
 
 def save_project_memory(memory: ProjectMemory, output_dir: Path | None = None) -> Path:
@@ -206,17 +185,12 @@ def save_project_memory(memory: ProjectMemory, output_dir: Path | None = None) -
 
     output_dir.mkdir(parents=True, exist_ok=True)
 
-    history_dir = output_dir / "history"
-    history_dir.mkdir(exist_ok=True)
-    history_file = history_dir / f"{datetime.now().strftime('%Y-%m-%d_%H%M%S')}.json"
-
     output_file = output_dir / "consolidated.json"
-    if output_file.exists():
-        import shutil
-        shutil.copy(output_file, history_file)
+    output_file.write_text(memory.model_dump_json(indent=2), encoding="utf-8")
 
-    with open(output_file, "w") as f:
-        json.dump(memory.model_dump(), f, indent=2)
+    # Keep every version in an append-only log, one compact document per line
+    with open(output_dir / "history.jsonl", "a", encoding="utf-8") as f:
+        f.write(memory.model_dump_json() + "\n")
 
     return output_file
 
@@ -227,5 +201,4 @@ def load_project_memory(project: str) -> ProjectMemory | None:
     if not memory_file.exists():
         return None
 
-    with open(memory_file) as f:
-        return ProjectMemory(**json.load(f))
+    return ProjectMemory.model_validate_json(memory_file.read_bytes())
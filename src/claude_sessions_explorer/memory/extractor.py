@@ -1,14 +1,16 @@
 """Session extraction logic using Claude Agent SDK."""
 
-import json
-import re
+import asyncio
+from collections.abc import AsyncIterator
 from datetime import datetime
+from functools import lru_cache
 from pathlib import Path
 
-from claude_agent_sdk import query, ClaudeAgentOptions
-from claude_agent_sdk.types import AssistantMessage, ResultMessage
+import orjson
 
+from .agent import collect_response, extract_fenced_json
 from ..models import SessionExtraction
+from ..session_index import build_session_index
 from ..prompts import get_extraction_prompt
 
 
@@ -17,78 +19,91 @@ PROJECTS_DIR = CLAUDE_DIR / "projects"
 DATA_DIR = Path(".data")
 
 
+_session_index: dict[str, str] | None = None
+
+
 def find_session_path(session_id: str) -> Path | None:
     """Find the session file path by session ID."""
-    for project_dir in PROJECTS_DIR.iterdir():
-        if not project_dir.is_dir():
-            continue
-        session_path = project_dir / f"{session_id}.jsonl"
-        if session_path.exists():
-            return session_path
-    return None
+    global _session_index
+    # Build once per process; a miss may be a session created since, so rebuild then
+    if _session_index is None or session_id not in _session_index:
+        _session_index = build_session_index(PROJECTS_DIR)
+    project_dir = _session_index.get(session_id)
+    return Path(project_dir, f"{session_id}.jsonl") if project_dir else None
 
 
 def get_project_name(session_path: Path) -> str:
     """Extract project name from session path."""
     project_dir = session_path.parent
-    index_file = project_dir / "sessions-index.json"
-    if index_file.exists():
-        with open(index_file) as f:
-            data = json.load(f)
-            entries = data.get("entries", [])
-            if entries:
-                project_path = entries[0].get("projectPath", "")
-                if project_path:
-                    return Path(project_path).name
+    try:
+        mtime_ns = (project_dir / "sessions-index.json").stat().st_mtime_ns
+    except FileNotFoundError:
+        return project_dir.name
+    return _project_name(project_dir, mtime_ns)
+
+
+@lru_cache(maxsize=256)
+def _project_name(project_dir: Path, mtime_ns: int) -> str:
+    """Read the project name from a sessions index, memoized on its mtime."""
+    data = orjson.loads((project_dir / "sessions-index.json").read_bytes())
+    entries = data.get("entries", [])
+    if entries:
+        project_path = entries[0].get("projectPath", "")
+        if project_path:
+            return Path(project_path).name
     return project_dir.name
 
 
-def load_session_trace(session_path: Path) -> str:
+def load_session_trace(session_path: Path, max_chars: int | None = None) -> str:
     """Load and format session as execution trace for analysis."""
-    messages = []
-    with open(session_path) as f:
+    trace_parts = []
+    trace_len = -2  # length of the joined trace; no separator before the first part
+    with open(session_path, "rb") as f:
         for line in f:
             try:
-                messages.append(json.loads(line))
-            except json.JSONDecodeError:
+                msg = orjson.loads(line)
+            except orjson.JSONDecodeError:
                 continue
 
-    trace_parts = []
-    for msg in messages:
-        if msg.get("isMeta"):
-            continue
-
-        role = msg.get("type", "unknown")
-        content = msg.get("message", {}).get("content", "")
-
-        if isinstance(content, list):
-            text_parts = []
-            tool_parts = []
-            for block in content:
-                if isinstance(block, dict):
-                    if block.get("type") == "text":
-                        text_parts.append(block.get("text", ""))
-                    elif block.get("type") == "tool_use":
-                        tool_name = block.get("name", "tool")
-                        tool_input = block.get("input", {})
-                        # Truncate large tool inputs
-                        input_str = json.dumps(tool_input)
-                        if len(input_str) > 500:
-                            input_str = input_str[:500] + "..."
-                        tool_parts.append(f"[Tool: {tool_name}] {input_str}")
-                    elif block.get("type") == "tool_result":
-                        result = block.get("content", "")
-                        if isinstance(result, str) and len(result) > 500:
-                            result = result[:500] + "..."
-                        tool_parts.append(f"[Tool Result] {result}")
-
-            content = "\n".join(text_parts + tool_parts)
-
-        if not content or not content.strip():
-            continue
-
-        label = "USER" if role == "user" else "ASSISTANT"
-        trace_parts.append(f"=== {label} ===\n{content}")
+            if msg.get("isMeta"):
+                continue
+
+            role = msg.get("type", "unknown")
+            content = msg.get("message", {}).get("content", "")
+
+            if isinstance(content, list):
+                text_parts = []
+                tool_parts = []
+                for block in content:
+                    if isinstance(block, dict):
+                        if block.get("type") == "text":
+                            text_parts.append(block.get("text", ""))
+                        elif block.get("type") == "tool_use":
+                            tool_name = block.get("name", "tool")
+                            tool_input = block.get("input", {})
+                            # Truncate large tool inputs
+                            input_str = orjson.dumps(tool_input).decode()
+                            if len(input_str) > 500:
+                                input_str = input_str[:500] + "..."
+                            tool_parts.append(f"[Tool: {tool_name}] {input_str}")
+                        elif block.get("type") == "tool_result":
+                            result = block.get("content", "")
+                            if isinstance(result, str) and len(result) > 500:
+                                result = result[:500] + "..."
+                            tool_parts.append(f"[Tool Result] {result}")
+
+                content = "\n".join(text_parts + tool_parts)
+
+            if not content or not content.strip():
+                continue
+
+            label = "USER" if role == "user" else "ASSISTANT"
+            trace_parts.append(f"=== {label} ===\n{content}")
+
+            # Anything past max_chars is cut by the caller, so stop reading there
+            trace_len += len(trace_parts[-1]) + 2
+            if max_chars is not None and trace_len > max_chars:
+                break
 
     return "\n\n".join(trace_parts)
 
@@ -102,7 +117,7 @@ async def extract_from_session(session_id: str, project: str | None = None, max_
     if not project:
         project = get_project_name(session_path)
 
-    trace = load_session_trace(session_path)
+    trace = await asyncio.to_thread(load_session_trace, session_path, max_trace_chars)
 
     # Truncate trace if too large to avoid context limits
     if len(trace) > max_trace_chars:
@@ -113,32 +128,14 @@ async def extract_from_session(session_id: str, project: str | None = None, max_
 
     # Call Claude via SDK (uses existing CLI configuration)
     # Enable tools so Claude can explore long traces, write code to analyze patterns, etc.
-    response_text = ""
-    async for msg in query(
-        prompt=user_prompt,
-        options=ClaudeAgentOptions(
-            max_turns=30,  # Allow many turns for thorough exploration and analysis
-            system_prompt=system_prompt
-        )
-    ):
-        if isinstance(msg, AssistantMessage):
-            for block in msg.content:
-                if hasattr(block, 'text'):
-                    response_text += block.text
-        elif isinstance(msg, ResultMessage) and msg.result:
-            # Prefer the final result if available
-            response_text = msg.result
+    response_text = await collect_response(user_prompt, system_prompt)
 
     # Extract JSON from response (may be wrapped in markdown code block)
-    json_match = re.search(r"```(?:json)?\s*([\s\S]*?)```", response_text)
-    if json_match:
-        json_str = json_match.group(1)
-    else:
-        json_str = response_text
+    json_str = extract_fenced_json(response_text)
 
     try:
-        data = json.loads(json_str)
-    except json.JSONDecodeError as e:
+        data = orjson.loads(json_str)
+    except orjson.JSONDecodeError as e:
         raise ValueError(f"Failed to parse extraction response: {e}\nResponse: {response_text[:500]}")
 
     # Build extraction result
@@ -155,6 +152,33 @@ async def extract_from_session(session_id: str, project: str | None = None, max_
     )
 
 
+async def extract_many(
+    sessions: list[tuple[str, str | None]], concurrency: int = 8
+) -> AsyncIterator[tuple[int, SessionExtraction | Exception]]:
+    """Extract (session_id, project) pairs concurrently, at most `concurrency` SDK sessions at a time.
+
+    Yields (index into sessions, extraction) as each one finishes, so callers can report
+    progress; a session that fails yields its exception instead.
+    """
+    sem = asyncio.Semaphore(concurrency)
+
+    async def extract_one(i: int, session_id: str, project: str | None):
+        async with sem:
+            try:
+                return i, await extract_from_session(session_id, project)
+            except Exception as e:
+                return i, e
+
+    tasks = [asyncio.create_task(extract_one(i, *session)) for i, session in enumerate(sessions)]
+    try:
+        for next_done in asyncio.as_completed(tasks):
+            yield await next_done
+    finally:
+        # Stop outstanding SDK sessions if the caller stops early
+        for task in tasks:
+            task.cancel()
+
+
 def save_extraction(extraction: SessionExtraction, output_dir: Path | None = None):
     """Save extraction to JSON file."""
     if output_dir is None:
@@ -163,7 +187,6 @@ def save_extraction(extraction: SessionExtraction, output_dir: Path | None = Non
     output_dir.mkdir(parents=True, exist_ok=True)
     output_file = output_dir / f"{extraction.session_id}.json"
 
-    with open(output_file, "w") as f:
-        json.dump(extraction.model_dump(), f, indent=2)
+    output_file.write_text(extraction.model_dump_json(indent=2), encoding="utf-8")
 
     return output_file
@@ -1,12 +1,14 @@
 """Generate CLAUDE.md and skills from consolidated project memory."""
 
-import json
+import asyncio
 import re
+import shutil
 from datetime import datetime
+from heapq import nlargest
+from operator import attrgetter
 from pathlib import Path
 
-from claude_agent_sdk import query, ClaudeAgentOptions
-from claude_agent_sdk.types import AssistantMessage, ResultMessage
+import orjson
 
 from ..models import ProjectMemory, ConsolidatedEpisodic, ConsolidatedGotcha
 from ..prompts.generate import (
@@ -18,11 +20,45 @@ from ..prompts.generate import (
     CLAUDEMD_PROMPT,
     VERIFY_SYSTEM_PROMPT,
 )
+from .agent import collect_response, extract_fenced_json
 from .consolidator import load_project_memory
 
 
 DATA_DIR = Path(".data")
-MAX_TURNS = 30  # Allow enough turns for thorough exploration
+
+_SKILL_NAME_RE = re.compile(r"[^a-z0-9-]")
+
+# Keywords that always mark a memory as stale/environment-specific
+_STALE_KEYWORDS = frozenset({"zoxide", "zsh", "__zoxide_z", "oh-my-zsh", "environment-specific"})
+_STALE_ISSUE_WORDS = ("zoxide", "zsh", "oh-my-zsh", "shell configuration")
+
+
+def _any_of(words) -> re.Pattern:
+    """Compile literal words into one alternation that finds any of them in a single scan."""
+    return re.compile("|".join(map(re.escape, words)))
+
+
+# Patterns that indicate this is NOT real CLAUDE.md content
+_INVALID_CONTENT_RE = _any_of((
+    '## key changes',
+    '## changes made',
+    '## summary of',
+    '### ✅',
+    '### removed',
+    '### verified',
+    '### kept',
+    'the file now contains',
+    'i have removed',
+    'i have fixed',
+))
+_SUMMARY_HEADING_WORDS = ('changes', 'summary', 'removed', 'verified', 'fixed')
+_SUMMARY_HEADING_RE = _any_of(_SUMMARY_HEADING_WORDS)
+_SUMMARY_TITLE_RE = _any_of(_SUMMARY_HEADING_WORDS + ('key ',))
+_PREAMBLE_STARTS = (
+    'perfect', 'now i', "let me", "i can see", "i'll", "here's",
+    "based on", "looking at", "after", "this is", "the following",
+    "great", "okay", "alright", "sure", "certainly"
+)
 
 
 def filter_stale_items(memory: ProjectMemory, verification: dict) -> ProjectMemory:
@@ -34,43 +70,44 @@ def filter_stale_items(memory: ProjectMemory, verification: dict) -> ProjectMemo
         return memory
 
     stale_items = set(s.lower() for s in verification.get("stale_items", []))
-    stale_keywords = {"zoxide", "zsh", "__zoxide_z", "oh-my-zsh", "environment-specific"}
+    stale_keywords = set(_STALE_KEYWORDS)
 
     # Also extract keywords from issue descriptions
     for issue in verification.get("issues", []):
         if issue.get("type") == "stale" and issue.get("severity") == "error":
             desc = issue.get("description", "").lower()
-            for word in ["zoxide", "zsh", "oh-my-zsh", "shell configuration"]:
-                if word in desc:
-                    stale_keywords.add(word)
+            stale_keywords.update(word for word in _STALE_ISSUE_WORDS if word in desc)
 
-    def is_stale(text: str) -> bool:
-        """Check if text contains stale keywords."""
-        text_lower = text.lower()
-        return any(kw in text_lower for kw in stale_keywords)
+    # One alternation scans for every keyword in a single pass over the text
+    stale_re = _any_of(stale_keywords)
+
+    def is_stale(*texts: str) -> bool:
+        """Check if any of the texts contains stale keywords."""
+        # Keywords never contain a newline, so joining cannot create false matches
+        return stale_re.search("\n".join(texts).lower()) is not None
 
     # Filter episodic memories
     filtered_episodic = [
         e for e in memory.episodic
-        if not is_stale(e.incident) and not is_stale(e.resolution) and getattr(e, 'scope', 'universal') != 'environment-specific'
+        if getattr(e, 'scope', 'universal') != 'environment-specific' and not is_stale(e.incident, e.resolution)
     ]
 
     # Filter gotchas
     filtered_gotchas = [
         g for g in memory.gotchas
-        if not is_stale(g.issue) and not is_stale(g.solution or "") and getattr(g, 'scope', 'universal') != 'environment-specific'
+        if getattr(g, 'scope', 'universal') != 'environment-specific' and not is_stale(g.issue, g.solution or "")
     ]
 
     # Filter procedural (remove workflows with stale steps)
     filtered_procedural = [
         p for p in memory.procedural
-        if not is_stale(p.workflow) and not any(is_stale(step) for step in p.steps)
+        if not is_stale(p.workflow, *p.steps)
     ]
 
     # Filter decisions
     filtered_decisions = [
         d for d in memory.decisions
-        if not is_stale(d.decision) and not is_stale(d.rationale)
+        if not is_stale(d.decision, d.rationale)
     ]
 
     # Create cleaned memory
@@ -92,29 +129,15 @@ def extract_final_markdown(text: str) -> str:
     """Extract the final CLAUDE.md content, removing thinking/preamble text."""
     lines = text.strip().split('\n')
 
-    # Patterns that indicate this is NOT real CLAUDE.md content
-    invalid_content_patterns = [
-        '## key changes',
-        '## changes made',
-        '## summary of',
-        '### ✅',
-        '### removed',
-        '### verified',
-        '### kept',
-        'the file now contains',
-        'i have removed',
-        'i have fixed',
-    ]
-
     # Check if the content looks like a summary instead of actual CLAUDE.md
     first_200_chars = text[:200].lower()
-    if any(pattern in first_200_chars for pattern in invalid_content_patterns):
+    if _INVALID_CONTENT_RE.search(first_200_chars):
         # This looks like a summary, not the actual file
         # Try to find actual CLAUDE.md content after the summary
         for i, line in enumerate(lines):
             stripped = line.strip().lower()
             # Look for a proper project heading
-            if stripped.startswith('# ') and not any(word in stripped for word in ['changes', 'summary', 'removed', 'verified', 'fixed']):
+            if stripped.startswith('# ') and not _SUMMARY_HEADING_RE.search(stripped):
                 return '\n'.join(lines[i:]).strip()
         # No valid content found - return error message
         return "# Error: Generation Failed\n\nThe generator produced a summary instead of actual CLAUDE.md content. Please regenerate."
@@ -125,155 +148,91 @@ def extract_final_markdown(text: str) -> str:
         stripped = line.strip()
         if not stripped:
             continue
+        lowered = stripped.lower()
         # Skip preamble patterns
-        preamble_patterns = [
-            'perfect', 'now i', "let me", "i can see", "i'll", "here's",
-            "based on", "looking at", "after", "this is", "the following",
-            "great", "okay", "alright", "sure", "certainly"
-        ]
-        if any(stripped.lower().startswith(p) for p in preamble_patterns):
+        if lowered.startswith(_PREAMBLE_STARTS):
             continue
         # Look for markdown heading that's actually a title
         if stripped.startswith('#') and not stripped.startswith('#!/'):
             # Make sure it's not a summary heading
-            if not any(word in stripped.lower() for word in ['changes', 'summary', 'removed', 'verified', 'fixed', 'key ']):
+            if not _SUMMARY_TITLE_RE.search(lowered):
                 start_idx = i
                 break
 
     return '\n'.join(lines[start_idx:]).strip()
 
 
-async def generate_claudemd(memory: ProjectMemory) -> str:
+async def generate_claudemd(memory: ProjectMemory, memory_json: str | None = None) -> str:
     """Generate CLAUDE.md content from project memory using Claude."""
-    memory_json = json.dumps(memory.model_dump(), indent=2)
+    if memory_json is None:
+        memory_json = memory.model_dump_json(indent=2)
     system_prompt, user_prompt = get_claudemd_prompt(memory_json)
 
     # Enable tools so Claude can explore the project structure if needed
-    response_text = ""
-    async for msg in query(
-        prompt=user_prompt,
-        options=ClaudeAgentOptions(
-            max_turns=MAX_TURNS,
-            system_prompt=system_prompt
-        )
-    ):
-        if isinstance(msg, AssistantMessage):
-            for block in msg.content:
-                if hasattr(block, 'text'):
-                    response_text += block.text
-        elif isinstance(msg, ResultMessage) and msg.result:
-            response_text = msg.result
+    response_text = await collect_response(user_prompt, system_prompt)
 
     # Clean up any preamble text before the actual markdown
     return extract_final_markdown(response_text)
 
 
-async def generate_skills(memory: ProjectMemory) -> dict[str, str]:
+async def generate_skills(memory: ProjectMemory, memory_json: str | None = None) -> dict[str, str]:
     """Generate skill files from project memory using Claude."""
     if not memory.procedural:
         return {}
 
-    memory_json = json.dumps(memory.model_dump(), indent=2)
+    if memory_json is None:
+        memory_json = memory.model_dump_json(indent=2)
     system_prompt, user_prompt = get_skills_prompt(memory_json)
 
     # Enable tools so Claude can explore the project to create better skills
-    response_text = ""
-    async for msg in query(
-        prompt=user_prompt,
-        options=ClaudeAgentOptions(
-            max_turns=MAX_TURNS,
-            system_prompt=system_prompt
-        )
-    ):
-        if isinstance(msg, AssistantMessage):
-            for block in msg.content:
-                if hasattr(block, 'text'):
-                    response_text += block.text
-        elif isinstance(msg, ResultMessage) and msg.result:
-            response_text = msg.result
-
-    json_match = re.search(r"```(?:json)?\s*([\s\S]*?)```", response_text)
-    if json_match:
-        json_str = json_match.group(1)
-    else:
-        json_str = response_text
+    response_text = await collect_response(user_prompt, system_prompt)
+
+    json_str = extract_fenced_json(response_text)
 
     try:
-        return json.loads(json_str)
-    except json.JSONDecodeError:
+        return orjson.loads(json_str)
+    except orjson.JSONDecodeError:
         return {}
 
 
-async def generate_tasks(memory: ProjectMemory) -> list[dict]:
+async def generate_tasks(memory: ProjectMemory, memory_json: str | None = None) -> list[dict]:
     """Generate actionable tasks from project memory to fix root causes."""
     # Only generate tasks if there are issues to address
     if not memory.gotchas and not memory.episodic:
         return []
 
-    memory_json = json.dumps(memory.model_dump(), indent=2)
+    if memory_json is None:
+        memory_json = memory.model_dump_json(indent=2)
     system_prompt, user_prompt = get_tasks_prompt(memory_json)
 
-    response_text = ""
-    async for msg in query(
-        prompt=user_prompt,
-        options=ClaudeAgentOptions(
-            max_turns=MAX_TURNS,
-            system_prompt=system_prompt
-        )
-    ):
-        if isinstance(msg, AssistantMessage):
-            for block in msg.content:
-                if hasattr(block, 'text'):
-                    response_text += block.text
-        elif isinstance(msg, ResultMessage) and msg.result:
-            response_text = msg.result
-
-    json_match = re.search(r"```(?:json)?\s*([\s\S]*?)```", response_text)
-    if json_match:
-        json_str = json_match.group(1)
-    else:
-        json_str = response_text
+    response_text = await collect_response(user_prompt, system_prompt)
+
+    json_str = extract_fenced_json(response_text)
 
     try:
-        tasks = json.loads(json_str)
+        tasks = orjson.loads(json_str)
         return tasks if isinstance(tasks, list) else []
-    except json.JSONDecodeError:
+    except orjson.JSONDecodeError:
         return []
 
 
-async def verify_content(content: str, memory: ProjectMemory) -> dict:
+async def verify_content(content: str, memory: ProjectMemory, memory_json: str | None = None) -> dict:
     """Verify generated content for issues, staleness, and deprecated patterns.
 
     This function uses Claude to ACTUALLY TEST if documented issues are still
     current by running commands, checking paths, etc.
     """
-    memory_json = json.dumps(memory.model_dump(), indent=2)
+    if memory_json is None:
+        memory_json = memory.model_dump_json(indent=2)
     system_prompt, user_prompt = get_verify_prompt(content, memory_json)
 
-    response_text = ""
-    async for msg in query(
-        prompt=user_prompt,
-        options=ClaudeAgentOptions(
-            max_turns=MAX_TURNS,
-            system_prompt=system_prompt
-        )
-    ):
-        if isinstance(msg, AssistantMessage):
-            for block in msg.content:
-                if hasattr(block, 'text'):
-                    response_text += block.text
-        elif isinstance(msg, ResultMessage) and msg.result:
-            response_text = msg.result
-
-    json_match = re.search(r"```(?:json)?\s*([\s\S]*?)```", response_text)
-    if json_match:
-        json_str = json_match.group(1)
-    else:
-        json_str = response_text
+    response_text = await collect_response(user_prompt, system_prompt)
+
+    json_str = extract_fenced_json(response_text)
 
     try:
-        return json.loads(json_str)
-    except json.JSONDecodeError:
+        return orjson.loads(json_str)
+    except orjson.JSONDecodeError:
         return {"is_valid": True, "issues": [], "summary": "Could not parse verification response", "score": 0}
 
 
@@ -289,22 +248,22 @@ def generate_claudemd_simple(memory: ProjectMemory) -> str:
 
     if memory.episodic:
         lines.extend(["## Common Errors", ""])
-        for item in sorted(memory.episodic, key=lambda x: -x.occurrences)[:10]:
-            lines.append(f"- **{item.incident}**: {item.resolution}")
+        lines.extend(
+            f"- **{item.incident}**: {item.resolution}"
+            for item in nlargest(10, memory.episodic, key=attrgetter("occurrences"))
+        )
         lines.append("")
 
     if memory.semantic:
         lines.extend(["## Conventions", ""])
-        for item in sorted(memory.semantic, key=lambda x: -x.frequency)[:15]:
-            lines.append(f"- {item.knowledge}")
+        lines.extend(f"- {item.knowledge}" for item in nlargest(15, memory.semantic, key=attrgetter("frequency")))
         lines.append("")
 
     if memory.procedural:
         lines.extend(["## Workflows", ""])
-        for item in sorted(memory.procedural, key=lambda x: -x.times_used)[:5]:
+        for item in nlargest(5, memory.procedural, key=attrgetter("times_used")):
             lines.append(f"### {item.workflow}")
-            for i, step in enumerate(item.steps, 1):
-                lines.append(f"{i}. {step}")
+            lines.extend(f"{i}. {step}" for i, step in enumerate(item.steps, 1))
             lines.append("")
 
     if memory.decisions:
@@ -316,9 +275,10 @@ def generate_claudemd_simple(memory: ProjectMemory) -> str:
 
     if memory.gotchas:
         lines.extend(["## Gotchas", ""])
-        for item in sorted(memory.gotchas, key=lambda x: -x.frequency)[:10]:
-            solution = f" - {item.solution}" if item.solution else ""
-            lines.append(f"- {item.issue}{solution}")
+        lines.extend(
+            f"- {item.issue} - {item.solution}" if item.solution else f"- {item.issue}"
+            for item in nlargest(10, memory.gotchas, key=attrgetter("frequency"))
+        )
         lines.append("")
 
     return "\n".join(lines)
@@ -333,7 +293,7 @@ def generate_skills_simple(memory: ProjectMemory) -> dict[str, str]:
             continue
 
         name = item.workflow.lower().replace(" ", "-")
-        name = re.sub(r"[^a-z0-9-]", "", name)
+        name = _SKILL_NAME_RE.sub("", name)
 
         content = [
             item.workflow,
@@ -372,87 +332,38 @@ def filter_low_frequency_items(memory: ProjectMemory, min_frequency: int = 2) ->
     )
 
 
-async def generate_all(
-    project: str,
-    use_llm: bool = True,
-    output_dir: Path | None = None,
-    verify: bool = True,
-    min_frequency: int = 2
+def _write_outputs(
+    output_dir: Path,
+    claudemd_content: str,
+    skills: dict[str, str],
+    knowledge_json: str,
+    tasks: list[dict],
+    verification: dict | None
 ) -> dict:
-    """Generate all output files from project memory with optional verification."""
-    memory = load_project_memory(project)
-    if not memory:
-        raise ValueError(f"No consolidated memory found for project: {project}")
-
-    if output_dir is None:
-        output_dir = DATA_DIR / "generated" / project
-
+    """Write generate_all's files and return their paths."""
     output_dir.mkdir(parents=True, exist_ok=True)
     skills_dir = output_dir / "skills"
     skills_dir.mkdir(exist_ok=True)
     tasks_dir = output_dir / "tasks"
     tasks_dir.mkdir(exist_ok=True)
 
-    if use_llm:
-        # Generate tasks FIRST from unfiltered memory (to capture all issues)
-        tasks = await generate_tasks(memory)
-
-        # Filter by frequency for CLAUDE.md generation
-        filtered_memory = filter_low_frequency_items(memory, min_frequency)
-
-        claudemd_content = await generate_claudemd(filtered_memory)
-        skills = await generate_skills(filtered_memory)
-
-        # Verification step - check for issues and deprecated patterns
-        verification = None
-        if verify:
-            verification = await verify_content(claudemd_content, filtered_memory)
-
-            # If there are error-level issues, filter stale items and regenerate
-            if verification.get("issues"):
-                error_issues = [i for i in verification["issues"] if i.get("severity") == "error"]
-                if error_issues:
-                    # Filter stale items from memory BEFORE regenerating
-                    cleaned_memory = filter_stale_items(filtered_memory, verification)
-
-                    # Include the issues in the prompt for regeneration
-                    issues_text = "\n".join([f"- {i['description']}: {i.get('suggestion', '')}" for i in error_issues])
-                    feedback_prompt = f"The previous generation had these issues:\n{issues_text}\n\nPlease fix these issues and regenerate."
-
-                    # Regenerate with CLEANED memory
-                    claudemd_content = await generate_claudemd_with_feedback(cleaned_memory, feedback_prompt)
-                    verification = await verify_content(claudemd_content, cleaned_memory)
-
-                    # Use cleaned memory for final output
-                    filtered_memory = cleaned_memory
-    else:
-        filtered_memory = filter_low_frequency_items(memory, min_frequency)
-        claudemd_content = generate_claudemd_simple(filtered_memory)
-        skills = generate_skills_simple(filtered_memory)
-        tasks = []  # No task generation without LLM
-        verification = None
-
     claudemd_path = output_dir / "CLAUDE.md"
-    with open(claudemd_path, "w") as f:
-        f.write(claudemd_content)
+    claudemd_path.write_text(claudemd_content, encoding="utf-8")
 
     skill_paths = []
     for name, content in skills.items():
         skill_path = skills_dir / f"{name}.md"
-        with open(skill_path, "w") as f:
-            f.write(content)
+        skill_path.write_text(content, encoding="utf-8")
         skill_paths.append(skill_path)
 
     knowledge_path = output_dir / "knowledge.json"
-    with open(knowledge_path, "w") as f:
-        json.dump(filtered_memory.model_dump(), f, indent=2)
+    knowledge_path.write_text(knowledge_json, encoding="utf-8")
 
     # Save tasks
     task_paths = []
     if tasks:
         tasks_json_path = tasks_dir / "tasks.json"
-        with open(tasks_json_path, "w") as f:
-            json.dump(tasks, f, indent=2)
+        tasks_json_path.write_bytes(orjson.dumps(tasks, option=orjson.OPT_INDENT_2))
         task_paths.append(tasks_json_path)
 
         # Also save individual task files for easy reading
@@ -483,15 +394,13 @@ async def generate_all(
 
 {', '.join(task.get('tags', []))}
 """
-            with open(task_path, "w") as f:
-                f.write(task_content)
+            task_path.write_text(task_content, encoding="utf-8")
             task_paths.append(task_path)
 
     # Save verification report
     if verification:
         verification_path = output_dir / "verification.json"
-        with open(verification_path, "w") as f:
-            json.dump(verification, f, indent=2)
+        verification_path.write_bytes(orjson.dumps(verification, option=orjson.OPT_INDENT_2))
     else:
         verification_path = None
 
@@ -501,13 +410,82 @@ async def generate_all(
         "tasks": task_paths,
         "knowledge": knowledge_path,
         "verification": verification_path,
-        "verification_result": verification,
     }
 
 
-async def generate_claudemd_with_feedback(memory: ProjectMemory, feedback: str) -> str:
+async def generate_all(
+    project: str,
+    use_llm: bool = True,
+    output_dir: Path | None = None,
+    verify: bool = True,
+    min_frequency: int = 2,
+    memory: ProjectMemory | None = None
+) -> dict:
+    """Generate all output files from project memory with optional verification."""
+    if memory is None:
+        memory = await asyncio.to_thread(load_project_memory, project)
+    if not memory:
+        raise ValueError(f"No consolidated memory found for project: {project}")
+
+    if output_dir is None:
+        output_dir = DATA_DIR / "generated" / project
+
+    if use_llm:
+        # Filter by frequency for CLAUDE.md generation
+        filtered_memory = filter_low_frequency_items(memory, min_frequency)
+        # Serialize once and share it across every prompt that uses the filtered memory
+        filtered_json = filtered_memory.model_dump_json(indent=2)
+
+        # The three generations are independent, so run them together.
+        # Tasks use the unfiltered memory (to capture all issues).
+        tasks, claudemd_content, skills = await asyncio.gather(
+            generate_tasks(memory),
+            generate_claudemd(filtered_memory, filtered_json),
+            generate_skills(filtered_memory, filtered_json),
+        )
+
+        # Verification step - check for issues and deprecated patterns
+        verification = None
+        if verify:
+            verification = await verify_content(claudemd_content, filtered_memory, filtered_json)
+
+            # If there are error-level issues, filter stale items and regenerate
+            if verification.get("issues"):
+                error_issues = [i for i in verification["issues"] if i.get("severity") == "error"]
+                if error_issues:
+                    # Filter stale items from memory BEFORE regenerating
+                    cleaned_memory = filter_stale_items(filtered_memory, verification)
+
+                    # Include the issues in the prompt for regeneration
+                    issues_text = "\n".join([f"- {i['description']}: {i.get('suggestion', '')}" for i in error_issues])
+                    feedback_prompt = f"The previous generation had these issues:\n{issues_text}\n\nPlease fix these issues and regenerate."
+
+                    # Regenerate with CLEANED memory
+                    cleaned_json = cleaned_memory.model_dump_json(indent=2)
+                    claudemd_content = await generate_claudemd_with_feedback(cleaned_memory, feedback_prompt, cleaned_json)
+                    verification = await verify_content(claudemd_content, cleaned_memory, cleaned_json)
+
+                    # Use cleaned memory for final output
+                    filtered_memory, filtered_json = cleaned_memory, cleaned_json
+    else:
+        filtered_memory = filter_low_frequency_items(memory, min_frequency)
+        filtered_json = filtered_memory.model_dump_json(indent=2)
+        claudemd_content = generate_claudemd_simple(filtered_memory)
+        skills = generate_skills_simple(filtered_memory)
+        tasks = []  # No task generation without LLM
+        verification = None
+
+    # Write the outputs off the event loop
+    paths = await asyncio.to_thread(
+        _write_outputs, output_dir, claudemd_content, skills, filtered_json, tasks, verification
+    )
+    return {**paths, "verification_result": verification}
+
+
+async def generate_claudemd_with_feedback(memory: ProjectMemory, feedback: str, memory_json: str | None = None) -> str:
     """Regenerate CLAUDE.md with feedback about issues to fix."""
-    memory_json = json.dumps(memory.model_dump(), indent=2)
+    if memory_json is None:
+        memory_json = memory.model_dump_json(indent=2)
     system_prompt, user_prompt = get_claudemd_prompt(memory_json)
 
     # Append feedback to the prompt with explicit instruction to output ONLY the file
@@ -529,20 +507,7 @@ You MUST output ONLY the corrected CLAUDE.md content.
 - Just output the corrected CLAUDE.md file content directly
 """
 
-    response_text = ""
-    async for msg in query(
-        prompt=user_prompt_with_feedback,
-        options=ClaudeAgentOptions(
-            max_turns=MAX_TURNS,
-            system_prompt=system_prompt + "\n\nCRITICAL: Output ONLY the CLAUDE.md file content. No explanations, no summaries, no 'here is the file'. Just the raw markdown starting with # heading."
-        )
-    ):
-        if isinstance(msg, AssistantMessage):
-            for block in msg.content:
-                if hasattr(block, 'text'):
-                    response_text += block.text
-        elif isinstance(msg, ResultMessage) and msg.result:
-            response_text = msg.result
+    response_text = await collect_response(user_prompt_with_feedback, system_prompt + "\n\nCRITICAL: Output ONLY the CLAUDE.md file content. No explanations, no summaries, no 'here is the file'. Just the raw markdown starting with # heading.")
 
     return extract_final_markdown(response_text)
 
@@ -553,24 +518,11 @@ async def query_memory(project: str, question: str) -> str:
     if not memory:
         raise ValueError(f"No consolidated memory found for project: {project}")
 
-    memory_json = json.dumps(memory.model_dump(), indent=2)
+    memory_json = memory.model_dump_json(indent=2)
     system_prompt, user_prompt = get_query_prompt(question, memory_json)
 
     # Enable tools so Claude can explore the project to answer questions better
-    response_text = ""
-    async for msg in query(
-        prompt=user_prompt,
-        options=ClaudeAgentOptions(
-            max_turns=MAX_TURNS,
-            system_prompt=system_prompt
-        )
-    ):
-        if isinstance(msg, AssistantMessage):
-            for block in msg.content:
-                if hasattr(block, 'text'):
-                    response_text += block.text
-        elif isinstance(msg, ResultMessage) and msg.result:
-            response_text = msg.result
+    response_text = await collect_response(user_prompt, system_prompt)
 
     return response_text.strip()
 
@@ -589,11 +541,9 @@ def apply_to_project(project: str, target_path: Path) -> dict:
         claudemd_dest = target_path / "CLAUDE.md"
         if claudemd_dest.exists():
             backup = target_path / f"CLAUDE.md.backup.{datetime.now().strftime('%Y%m%d_%H%M%S')}"
-            import shutil
             shutil.copy(claudemd_dest, backup)
             results["backup"] = str(backup)
 
-        import shutil
         shutil.copy(claudemd_src, claudemd_dest)
         results["copied"].append(str(claudemd_dest))
 
@@ -604,7 +554,6 @@ def apply_to_project(project: str, target_path: Path) -> dict:
 
         for skill_file in skills_src.glob("*.md"):
             dest_file = skills_dest / skill_file.name
-            import shutil
             shutil.copy(skill_file, dest_file)
             results["copied"].append(str(dest_file))
 
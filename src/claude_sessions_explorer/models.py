@@ -1,10 +1,18 @@
 """Pydantic models for session extraction."""
 
-from pydantic import BaseModel
+import sys
+
+from pydantic import BaseModel, ConfigDict, TypeAdapter, field_validator
+
+
+# Models are built once from LLM/JSON output and only read afterwards
+MODEL_CONFIG = ConfigDict(extra="ignore", frozen=True)
 
 
 class EpisodicMemory(BaseModel):
     """A specific incident or problem encountered during a session."""
+    model_config = MODEL_CONFIG
+
     incident: str
     context: str
     resolution: str
@@ -15,6 +23,8 @@ class EpisodicMemory(BaseModel):
 
 class SemanticMemory(BaseModel):
     """A piece of knowledge or fact learned about the codebase."""
+    model_config = MODEL_CONFIG
+
     knowledge: str
     category: str
     confidence: str = "medium"
@@ -22,53 +32,75 @@ class SemanticMemory(BaseModel):
 
 class ProceduralMemory(BaseModel):
     """A workflow or process discovered during the session."""
+    model_config = MODEL_CONFIG
+
     workflow: str
-    steps: list[str]
+    steps: tuple[str, ...]
     trigger: str | None = None
 
 
 class Decision(BaseModel):
     """An architectural or design decision made during the session."""
+    model_config = MODEL_CONFIG
+
     decision: str
     rationale: str
-    alternatives_considered: list[str] = []
+    alternatives_considered: tuple[str, ...] = ()
     date: str | None = None
 
 
 class Gotcha(BaseModel):
     """A non-obvious issue or pitfall discovered in the codebase."""
+    model_config = MODEL_CONFIG
+
     issue: str
     cause: str | None = None
     solution: str | None = None
-    tags: list[str] = []
+    tags: tuple[str, ...] = ()
     scope: str = "universal"  # "universal" | "environment-specific"
 
 
 class SessionExtraction(BaseModel):
     """Complete extraction result from a session."""
+    model_config = MODEL_CONFIG
+
     session_id: str
     project: str
     extracted_at: str
     session_summary: str
-    episodic: list[EpisodicMemory] = []
-    semantic: list[SemanticMemory] = []
-    procedural: list[ProceduralMemory] = []
-    decisions: list[Decision] = []
-    gotchas: list[Gotcha] = []
+    episodic: tuple[EpisodicMemory, ...] = ()
+    semantic: tuple[SemanticMemory, ...] = ()
+    procedural: tuple[ProceduralMemory, ...] = ()
+    decisions: tuple[Decision, ...] = ()
+    gotchas: tuple[Gotcha, ...] = ()
+
+
+# Built once: serializes a whole batch of extractions in a single pydantic-core call
+EXTRACTION_LIST_ADAPTER = TypeAdapter(list[SessionExtraction])
 
 
 class ConsolidatedEpisodic(BaseModel):
     """Consolidated episodic memory with frequency tracking."""
+    model_config = MODEL_CONFIG
+
     incident: str
     resolution: str
     occurrences: int = 1
-    sessions: list[str] = []
+    sessions: tuple[str, ...] = ()
     last_seen: str | None = None
     scope: str = "universal"  # "universal" | "environment-specific"
 
+    @field_validator("sessions")
+    @classmethod
+    def _intern_sessions(cls, sessions: tuple[str, ...]) -> tuple[str, ...]:
+        """Share one string per session ID across every item that cites it."""
+        return tuple(map(sys.intern, sessions))
+
 
 class ConsolidatedSemantic(BaseModel):
     """Consolidated semantic memory with confidence weighting."""
+    model_config = MODEL_CONFIG
+
     knowledge: str
     category: str
     frequency: int = 1
@@ -77,52 +109,62 @@ class ConsolidatedSemantic(BaseModel):
 
 class ConsolidatedProcedural(BaseModel):
     """Consolidated procedural memory with usage tracking."""
+    model_config = MODEL_CONFIG
+
     workflow: str
-    steps: list[str]
+    steps: tuple[str, ...]
     trigger: str | None = None
     times_used: int = 1
 
 
 class ConsolidatedDecision(BaseModel):
     """Consolidated decision with status tracking."""
+    model_config = MODEL_CONFIG
+
     decision: str
     rationale: str
-    alternatives_considered: list[str] = []
+    alternatives_considered: tuple[str, ...] = ()
     status: str = "active"
     date: str | None = None
 
 
 class ConsolidatedGotcha(BaseModel):
     """Consolidated gotcha with frequency tracking."""
+    model_config = MODEL_CONFIG
+
     issue: str
     cause: str | None = None
     solution: str | None = None
-    tags: list[str] = []
+    tags: tuple[str, ...] = ()
     frequency: int = 1
     scope: str = "universal"  # "universal" | "environment-specific"
 
 
 class ActionableTask(BaseModel):
     """A task generated from session analysis to fix a root cause."""
+    model_config = MODEL_CONFIG
+
     title: str
     description: str
     task_type: str = "fix"  # "fix" | "improvement" | "automation" | "investigation"
     priority: str = "medium"  # "high" | "medium" | "low"
     source_issue: str | None = None  # The gotcha/incident that triggered this
     suggested_approach: str | None = None
-    tags: list[str] = []
+    tags: tuple[str, ...] = ()
 
 
 class ProjectMemory(BaseModel):
     """Consolidated project memory from all sessions."""
+    model_config = MODEL_CONFIG
+
     project: str
     project_path: str | None = None
     generated_at: str
     sessions_analyzed: int = 0
     last_session: str | None = None
-    episodic: list[ConsolidatedEpisodic] = []
-    semantic: list[ConsolidatedSemantic] = []
-    procedural: list[ConsolidatedProcedural] = []
-    decisions: list[ConsolidatedDecision] = []
-    gotchas: list[ConsolidatedGotcha] = []
-    tasks: list[ActionableTask] = []  # Generated tasks to fix issues
+    episodic: tuple[ConsolidatedEpisodic, ...] = ()
+    semantic: tuple[ConsolidatedSemantic, ...] = ()
+    procedural: tuple[ConsolidatedProcedural, ...] = ()
+    decisions: tuple[ConsolidatedDecision, ...] = ()
+    gotchas: tuple[ConsolidatedGotcha, ...] = ()
+    tasks: tuple[ActionableTask, ...] = ()  # Generated tasks to fix issues
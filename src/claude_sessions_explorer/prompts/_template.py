@@ -0,0 +1,36 @@
+"""Split prompt templates once at import for cheap per-call assembly."""
+
+
+def split_template(template: str, *slots: str) -> tuple[str, ...]:
+    """
+    Split a str.format template around its placeholders.
+
+    The template is formatted once with a marker in each slot, so its {{ }} escapes
+    are resolved, and the fixed text around the slots is returned for a plain join
+    per call.
+
+    Args:
+        template: The str.format template
+        *slots: Placeholder names, in the order they appear in the template
+
+    Returns:
+        The len(slots) + 1 pieces of fixed text, interleaving with the slots in order
+
+    Raises:
+        ValueError: If a slot is missing, repeated, or out of the given order
+    """
+    markers = [f"\0{i}\0" for i in range(len(slots))]
+    text = template.format(**dict(zip(slots, markers)))
+
+    parts = []
+    start = 0
+    for slot, marker in zip(slots, markers):
+        if text.count(marker) != 1:
+            raise ValueError(f"Template must contain {{{slot}}} exactly once")
+        pos = text.find(marker, start)
+        if pos == -1:
+            raise ValueError(f"Template has {{{slot}}} out of order, expected slots {slots}")
+        parts.append(text[start:pos])
+        start = pos + len(marker)
+    parts.append(text[start:])
+    return tuple(parts)
@@ -7,6 +7,8 @@ Inspired by:
 - Cognitive science: Memory consolidation through repetition and reinforcement
 """
 
+from ._template import split_template
+
 CONSOLIDATION_SYSTEM_PROMPT = '''You are a Smart Memory Manager, specialized in consolidating knowledge from multiple Claude Code sessions into a unified project memory.
 
 Your role is similar to Mem0's memory update system - you perform four operations:
@@ -249,6 +251,11 @@ YOU WILL BE PENALIZED IF YOU:
 {extractions}
 '''
 
+_CONSOLIDATION_PREFIX, _CONSOLIDATION_MIDDLE, _CONSOLIDATION_SUFFIX = split_template(
+    CONSOLIDATION_PROMPT, "existing_memory", "extractions"
+)
+
+
 def get_consolidation_prompt(
     extractions: str,
     existing_memory: str = "None - this is the first consolidation."
@@ -263,8 +270,7 @@ def get_consolidation_prompt(
     Returns:
         Tuple of (system_prompt, user_prompt)
     """
-    user_prompt = CONSOLIDATION_PROMPT.format(
-        extractions=extractions,
-        existing_memory=existing_memory
-    )
+    user_prompt = "".join((
+        _CONSOLIDATION_PREFIX, existing_memory, _CONSOLIDATION_MIDDLE, extractions, _CONSOLIDATION_SUFFIX
+    ))
     return CONSOLIDATION_SYSTEM_PROMPT, user_prompt
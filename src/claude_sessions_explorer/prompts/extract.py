@@ -7,6 +7,8 @@ Inspired by:
 - DSPy (dspy.ai): Structured signature-based prompting with tips
 """
 
+from ._template import split_template
+
 # Tips for extraction quality (inspired by DSPy's TIPS dictionary)
 EXTRACTION_TIPS = {
     "thorough": "Extract ALL learnings, even minor ones. More is better than missing important details.",
@@ -220,6 +222,17 @@ YOU WILL BE PENALIZED IF YOU:
 {session_trace}
 '''
 
+_EXTRACTION_PREFIX, _EXTRACTION_MIDDLE, _EXTRACTION_SUFFIX = split_template(
+    EXTRACTION_PROMPT, "tip", "session_trace"
+)
+
+# The tips are fixed, so everything before the trace is prebuilt per tip
+_EXTRACTION_HEAD_BY_TIP = {
+    key: _EXTRACTION_PREFIX + tip + _EXTRACTION_MIDDLE
+    for key, tip in EXTRACTION_TIPS.items()
+}
+
+
 def get_extraction_prompt(session_trace: str, tip_key: str = "practical") -> tuple[str, str]:
     """
     Get the extraction prompt with the specified tip.
@@ -231,9 +244,6 @@ def get_extraction_prompt(session_trace: str, tip_key: str = "practical") -> tup
     Returns:
         Tuple of (system_prompt, user_prompt)
     """
-    tip = EXTRACTION_TIPS.get(tip_key, EXTRACTION_TIPS["practical"])
-    user_prompt = EXTRACTION_PROMPT.format(
-        tip=tip,
-        session_trace=session_trace
-    )
+    head = _EXTRACTION_HEAD_BY_TIP.get(tip_key, _EXTRACTION_HEAD_BY_TIP["practical"])
+    user_prompt = "".join((head, session_trace, _EXTRACTION_SUFFIX))
     return EXTRACTION_SYSTEM_PROMPT, user_prompt
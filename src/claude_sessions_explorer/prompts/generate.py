@@ -7,6 +7,8 @@ Inspired by:
 - Mem0's PROCEDURAL_MEMORY_SYSTEM_PROMPT: Step-by-step workflow documentation
 """
 
+from ._template import split_template
+
 # Tips for generation (inspired by DSPy's TIPS dictionary)
 GENERATION_TIPS = {
     "concise": "Keep all content brief and scannable. Remove fluff.",
@@ -342,15 +344,15 @@ Scoring:
 
 ---
 
-## GENERATED CONTENT TO VERIFY
+## SOURCE PROJECT MEMORY
 
-{content}
+{memory}
 
 ---
 
-## SOURCE PROJECT MEMORY
+## GENERATED CONTENT TO VERIFY
 
-{memory}
+{content}
 '''
 
 QUERY_SYSTEM_PROMPT = '''You are a Project Memory Assistant, specialized in answering questions about a codebase using stored project knowledge.
@@ -407,28 +409,40 @@ If not in memory:
 '''
 
 
+_CLAUDEMD_PREFIX, _CLAUDEMD_MIDDLE, _CLAUDEMD_SUFFIX = split_template(CLAUDEMD_PROMPT, "tip", "memory")
+_SKILLS_PREFIX, _SKILLS_SUFFIX = split_template(SKILLS_PROMPT, "memory")
+_VERIFY_PREFIX, _VERIFY_MIDDLE, _VERIFY_SUFFIX = split_template(VERIFY_PROMPT, "memory", "content")
+_QUERY_PREFIX, _QUERY_MIDDLE, _QUERY_SUFFIX = split_template(QUERY_PROMPT, "memory", "question")
+
+# The tips are fixed, so everything before the memory is prebuilt per tip
+_CLAUDEMD_HEAD_BY_TIP = {
+    key: _CLAUDEMD_PREFIX + tip + _CLAUDEMD_MIDDLE
+    for key, tip in GENERATION_TIPS.items()
+}
+
+
 def get_claudemd_prompt(memory: str, tip_key: str = "actionable") -> tuple[str, str]:
     """Get the CLAUDE.md generation prompt."""
-    tip = GENERATION_TIPS.get(tip_key, GENERATION_TIPS["actionable"])
-    user_prompt = CLAUDEMD_PROMPT.format(memory=memory, tip=tip)
+    head = _CLAUDEMD_HEAD_BY_TIP.get(tip_key, _CLAUDEMD_HEAD_BY_TIP["actionable"])
+    user_prompt = "".join((head, memory, _CLAUDEMD_SUFFIX))
     return CLAUDEMD_SYSTEM_PROMPT, user_prompt
 
 
 def get_skills_prompt(memory: str) -> tuple[str, str]:
     """Get the skills generation prompt."""
-    user_prompt = SKILLS_PROMPT.format(memory=memory)
+    user_prompt = "".join((_SKILLS_PREFIX, memory, _SKILLS_SUFFIX))
     return SKILLS_SYSTEM_PROMPT, user_prompt
 
 
 def get_verify_prompt(content: str, memory: str) -> tuple[str, str]:
     """Get the verification prompt."""
-    user_prompt = VERIFY_PROMPT.format(content=content, memory=memory)
+    user_prompt = "".join((_VERIFY_PREFIX, memory, _VERIFY_MIDDLE, content, _VERIFY_SUFFIX))
     return VERIFY_SYSTEM_PROMPT, user_prompt
 
 
 def get_query_prompt(question: str, memory: str) -> tuple[str, str]:
     """Get the query prompt."""
-    user_prompt = QUERY_PROMPT.format(question=question, memory=memory)
+    user_prompt = "".join((_QUERY_PREFIX, memory, _QUERY_MIDDLE, question, _QUERY_SUFFIX))
     return QUERY_SYSTEM_PROMPT, user_prompt
 
 
@@ -528,7 +542,10 @@ Return empty array `[]` if no actionable tasks can be generated.
 '''
 
 
+_TASKS_PREFIX, _TASKS_SUFFIX = split_template(TASKS_PROMPT, "memory")
+
+
 def get_tasks_prompt(memory: str) -> tuple[str, str]:
     """Get the task generation prompt."""
-    user_prompt = TASKS_PROMPT.format(memory=memory)
+    user_prompt = "".join((_TASKS_PREFIX, memory, _TASKS_SUFFIX))
     return TASKS_SYSTEM_PROMPT, user_prompt
@@ -0,0 +1,21 @@
+"""Index Claude Code session files by session ID.
+
+Standard library only, so the browse CLI can import it without pydantic or the Agent SDK.
+"""
+
+import os
+from pathlib import Path
+
+
+def build_session_index(projects_dir: Path) -> dict[str, str]:
+    """Map every session ID to the project directory holding it, in one pass over projects_dir."""
+    index: dict[str, str] = {}
+    with os.scandir(projects_dir) as projects:
+        for project in projects:
+            if not project.is_dir():
+                continue
+            with os.scandir(project.path) as files:
+                for entry in files:
+                    if entry.name.endswith(".jsonl"):
+                        index.setdefault(entry.name[:-6], project.path)
+    return index